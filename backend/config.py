@@ -1,30 +1,46 @@
 """
 Configuration settings for DS Task AI News application.
 """
-import os
+from functools import lru_cache
 from typing import List, Dict
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv("./.env")
+_DOTENV_LOADED = False
+
+
+def _load_dotenv_once() -> None:
+    """Load environment variables from the .env file a single time per process."""
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        load_dotenv("./.env")
+        _DOTENV_LOADED = True
 
 
 class Settings(BaseSettings):
-    """Application settings loaded from environment variables."""
+    """
+    Application settings loaded from environment variables.
+
+    pydantic-settings reads each field from the matching upper-case
+    environment variable (e.g. COHERE_API_KEY), so defaults are plain values.
+    """
     
     # API Keys
-    cohere_api_key: str = os.getenv("COHERE_API_KEY", "")
-    groq_api_key: str = os.getenv("GROQ_API_KEY", "")
-    pinecone_api_key: str = os.getenv("PINECONE_API_KEY", "")
+    cohere_api_key: str = ""
+    groq_api_key: str = ""
+    pinecone_api_key: str = ""
 
     # Pinecone settings
-    pinecone_index_name: str = os.getenv("PINECONE_INDEX_NAME", "news-articles")
-    pinecone_namespace: str = os.getenv("PINECONE_NAMESPACE", "default")
+    pinecone_index_name: str = "news-articles"
+    pinecone_namespace: str = "default"
+    stats_cache_ttl: int = 30  # Seconds to reuse describe_index_stats results
+    vector_ingest_chunk_size: int = 1000  # Articles embedded and upserted per add_articles step
+    upserted_ids_path: str = "data/raw_news/seen_ids.sqlite"  # IDs already upserted; empty disables the check
     
     # Data directories
-    raw_news_dir: str = os.getenv("RAW_NEWS_DIR", "data/raw_news")
-    processed_news_dir: str = os.getenv("PROCESSED_NEWS_DIR", "data/processed_news")
+    raw_news_dir: str = "data/raw_news"
+    processed_news_dir: str = "data/processed_news"
     
     # RSS Feed URLs organized by category
     rss_feeds: Dict[str, List[str]] = {
@@ -39,10 +55,16 @@ class Settings(BaseSettings):
     # Embedding settings
     embedding_model: str = "embed-english-v3.0"
     embedding_dimension: int = 1024
+    embedding_cache_path: str = "data/embedding_cache.db"  # Empty disables the cache
+    query_embedding_cache_size: int = 1024  # Query vectors memoized in memory
 
     # Cohere API rate limiting (for trial accounts)
-    cohere_batch_size: int = int(os.getenv("COHERE_BATCH_SIZE", "10"))
-    cohere_rate_limit_delay: float = float(os.getenv("COHERE_RATE_LIMIT_DELAY", "6.0"))
+    cohere_batch_size: int = 10
+    cohere_parallelism: int = 4  # Concurrent embed requests
+    cohere_max_tokens: int = 2000  # Per-text budget (~4 chars per token)
+    cohere_tokens_per_minute: int = 100000  # Trial tier budget
+    cohere_rerank_per_minute: int = 10  # Trial tier rerank call limit
+    cohere_rerank_concurrency: int = 4  # Rerank requests in flight at once
     
     # LLM settings
     groq_model: str = "meta-llama/llama-4-scout-17b-16e-instruct"
@@ -53,17 +75,26 @@ class Settings(BaseSettings):
     summary_min_words: int = 175  # Consistent summary length
     summary_max_words: int = 175  # Consistent summary length (same as min for uniformity)
     processing_batch_size: int = 10
-    groq_rate_limit_delay: float = 2.0  # seconds between API calls (30 calls per minute = 2 seconds)
+    processing_workers: int = 2  # Raw news files processed in parallel
+    cleaning_workers: int = 4  # Threads cleaning article content, shared across files
+    groq_requests_per_minute: int = 30  # Groq free tier request limit
+    groq_tokens_per_minute: int = 30000  # Groq free tier token limit
     content_cleaning_enabled: bool = True
+    summary_cache_path: str = "data/summary_cache.db"  # Empty disables the cache
 
     # Groq batch processing settings
     groq_batch_size: int = 15  # Number of articles to process in one API call
+    groq_max_concurrency: int = 2  # Batch requests in flight at once
+    groq_max_retries: int = 4  # Retries with exponential backoff on 429/5xx/connection errors
     groq_max_tokens_per_request: int = 25000  # Conservative limit for 30k token capacity
     groq_max_content_length_per_article: int = 1500  # Max content length per article for batching
 
     # News fetching settings
     fetch_interval_hours: int = 6
     max_articles_per_feed: int = 50
+    feed_fetch_workers: int = 16  # Feeds fetched in parallel
+    max_feed_bytes: int = 2 * 1024 * 1024  # debug_rss reads at most this much of a feed; the rest is cut off
+    fetch_max_feed_bytes: int = 16 * 1024 * 1024  # Fetcher keeps this much of a feed body; items cut off past it are dropped
     deduplication_enabled: bool = True
     
     # API settings
@@ -74,10 +105,18 @@ class Settings(BaseSettings):
     # Recommendation settings
     max_recommendations: int = 10
     similarity_threshold: float = 0.25
+    query_cache_size: int = 1024  # Ranked results kept per normalized text query
+    query_cache_ttl: int = 300  # Seconds a text-query result is reused
+    trending_cache_ttl: int = 900  # Trending topics change slowly
+    similar_cache_size: int = 4096  # Article-to-article results kept per (article_id, max_results)
+    similar_cache_ttl: int = 600
+    semantic_cache_enabled: bool = True  # Reuse results of recent near-identical queries
+    semantic_cache_size: int = 1024  # Recent query embeddings kept for paraphrase matching
+    semantic_cache_threshold: float = 0.95  # Cosine similarity to reuse a recent query's results (0.9-1.0)
 
     # Pipeline settings
     pipeline_mode: bool = False  # True when running standalone pipeline
-    skip_vector_operations: bool = os.getenv("SKIP_VECTOR_OPERATIONS", "false").lower() == "true"
+    skip_vector_operations: bool = False
     cleanup_old_files: bool = True
     max_raw_files_to_keep: int = 10
     max_processed_files_to_keep: int = 10
@@ -86,15 +125,25 @@ class Settings(BaseSettings):
     archive_old_data: bool = True
     archive_after_days: int = 30
     
+    @field_validator("semantic_cache_threshold")
+    @classmethod
+    def _check_semantic_cache_threshold(cls, value: float) -> float:
+        # Below 0.9 the cache starts returning results for genuinely different queries
+        if not 0.9 <= value <= 1.0:
+            raise ValueError("semantic_cache_threshold must be between 0.9 and 1.0")
+        return value
+
     class Config:
         env_file = "../.env"  # Look for .env in parent directory
         case_sensitive = False
 
 
-# Global settings instance
-settings = Settings()
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get application settings."""
-    return settings
+    _load_dotenv_once()
+    return Settings()
+
+
+# Global settings instance
+settings = get_settings()
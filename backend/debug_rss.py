@@ -2,67 +2,252 @@
 """
 Debug script to test RSS feed parsing.
 """
+import io
+import json
+import os
+import threading
 import feedparser
 import requests
 import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from lxml import etree
+from config import get_settings
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-def test_rss_feed(url):
-    """Test parsing a single RSS feed."""
-    print(f"\n=== Testing RSS feed: {url} ===")
+settings = get_settings()
+
+# Shared session so connections and TLS handshakes are reused across feeds
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
+# Keep-alive pool sized for the worker threads, with cheap retries on gateway errors
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+# Validators (ETag / Last-Modified) and parsed entries from the last successful fetch
+FEED_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "ds_ai_news", "etags.json")
+_feed_cache_lock = threading.Lock()
 
+def _load_feed_cache():
+    """Load the conditional-GET sidecar, returning an empty cache if unavailable."""
     try:
-        # Use requests with SSL verification disabled for better compatibility
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        with open(FEED_CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_feed_cache(cache):
+    """Persist the conditional-GET sidecar."""
+    try:
+        os.makedirs(os.path.dirname(FEED_CACHE_PATH), exist_ok=True)
+        with open(FEED_CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"Could not save feed cache: {e}")
+
+_FEED_CACHE = _load_feed_cache()
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+CONTENT_NS = "{http://purl.org/rss/1.0/modules/content/}"
+ITEM_TAGS = ("item", f"{ATOM_NS}entry")
+
+def _item_to_entry(elem):
+    """Pull the fields the report prints out of an RSS <item> or Atom <entry>."""
+    if elem.tag == "item":
+        return {
+            'title': elem.findtext("title"),
+            'link': elem.findtext("link"),
+            'summary': elem.findtext("description"),
+            'published': elem.findtext("pubDate"),
+            'content': elem.findtext(f"{CONTENT_NS}encoded"),
         }
 
+    link = elem.find(f"{ATOM_NS}link")
+    return {
+        'title': elem.findtext(f"{ATOM_NS}title"),
+        'link': link.get("href") if link is not None else None,
+        'summary': elem.findtext(f"{ATOM_NS}summary"),
+        'published': elem.findtext(f"{ATOM_NS}published") or elem.findtext(f"{ATOM_NS}updated"),
+        'content': elem.findtext(f"{ATOM_NS}content"),
+    }
+
+def parse_feed_streaming(content, max_entries=3, max_items=None, truncated=False):
+    """
+    Walk the feed with lxml's iterparse, keeping only the first few entries.
+
+    Items are cleared as soon as they have been read so memory stays flat
+    for large feeds, and parsing stops once max_items items have been seen.
+    A body cut short by the download cap is expected to end mid-document,
+    so items read before that point are still returned. Raises
+    etree.XMLSyntaxError on any other malformed XML.
+    """
+    feed_info = {'title': None, 'description': None}
+    entries = []
+    entry_count = 0
+    item_depth = 0
+
+    try:
+        for event, elem in etree.iterparse(io.BytesIO(content), events=("start", "end")):
+            if elem.tag in ITEM_TAGS:
+                if event == "start":
+                    item_depth += 1
+                    continue
+                item_depth -= 1
+                entry_count += 1
+                if len(entries) < max_entries:
+                    entries.append(_item_to_entry(elem))
+                elem.clear()
+                if max_items and entry_count >= max_items:
+                    break
+            elif event == "end" and item_depth == 0:
+                # Channel-level metadata sits outside any item
+                if elem.tag in ("title", f"{ATOM_NS}title") and feed_info['title'] is None:
+                    feed_info['title'] = elem.text
+                elif elem.tag in ("description", f"{ATOM_NS}subtitle") and feed_info['description'] is None:
+                    feed_info['description'] = elem.text
+    except etree.XMLSyntaxError:
+        if not (truncated and entry_count):
+            raise
+
+    return feed_info, entries, entry_count
+
+def _download_capped(url, headers, max_bytes):
+    """
+    GET a feed, reading at most max_bytes of the (decompressed) body.
+
+    Returns:
+        Tuple of (response, body_bytes, truncated)
+    """
+    response = _SESSION.get(url, headers=headers, verify=False, timeout=30, stream=True)
+    try:
+        response.raise_for_status()
+        body = response.raw.read(max_bytes + 1, decode_content=True) or b""
+    finally:
+        response.close()
+
+    truncated = len(body) > max_bytes
+    return response, body[:max_bytes], truncated
+
+def _parse_with_feedparser(source, max_entries=3):
+    """Fallback parser, used when the feed is not well-formed XML."""
+    feed = feedparser.parse(source)
+    feed_info = {
+        'title': getattr(feed.feed, 'title', None),
+        'description': getattr(feed.feed, 'description', None),
+        'bozo': feed.bozo,
+        'bozo_exception': getattr(feed, 'bozo_exception', None),
+    }
+
+    entries = []
+    for entry in feed.entries[:max_entries]:
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            published = str(datetime(*entry.published_parsed[:6]))
+        else:
+            published = getattr(entry, 'published', None)
+
+        content = None
+        if hasattr(entry, 'content') and entry.content:
+            content = entry.content[0].value if isinstance(entry.content, list) else entry.content
+
+        entries.append({
+            'title': getattr(entry, 'title', None),
+            'link': getattr(entry, 'link', None),
+            'summary': getattr(entry, 'summary', None),
+            'published': published,
+            'content': content or getattr(entry, 'description', None),
+        })
+
+    return feed_info, entries, len(feed.entries)
+
+def test_rss_feed(url):
+    """Test parsing a single RSS feed and return the report as a string."""
+    out = io.StringIO()
+    out.write(f"\n=== Testing RSS feed: {url} ===\n")
+
+    try:
+        # Send validators from the previous fetch so unchanged feeds come back as 304
+        cached = _FEED_CACHE.get(url)
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        # Use requests with SSL verification disabled for better compatibility
         try:
-            response = requests.get(url, headers=headers, verify=False, timeout=30)
-            response.raise_for_status()
-            feed = feedparser.parse(response.content)
+            response, body, truncated = _download_capped(url, headers, settings.max_feed_bytes)
+            if truncated:
+                out.write(f"Feed larger than {settings.max_feed_bytes} bytes, only the first part was read\n")
+
+            if response.status_code == 304 and cached:
+                out.write("Not modified (304), using cached entries\n")
+                feed_info, entries, entry_count = cached['feed_info'], cached['entries'], cached['entry_count']
+            else:
+                try:
+                    feed_info, entries, entry_count = parse_feed_streaming(
+                        body, max_items=settings.max_articles_per_feed, truncated=truncated
+                    )
+                    feed_info['bozo'] = False
+                except etree.XMLSyntaxError as xml_error:
+                    # Malformed XML: let feedparser report what is wrong with it
+                    out.write(f"Streaming parse failed, using feedparser: {xml_error}\n")
+                    feed_info, entries, entry_count = _parse_with_feedparser(body)
+
+                with _feed_cache_lock:
+                    _FEED_CACHE[url] = {
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                        'feed_info': {**feed_info, 'bozo_exception': str(feed_info.get('bozo_exception') or '')},
+                        'entries': entries,
+                        'entry_count': entry_count,
+                    }
         except Exception as req_error:
-            print(f"Requests failed, trying feedparser directly: {req_error}")
-            feed = feedparser.parse(url)
-        
-        print(f"Feed title: {getattr(feed.feed, 'title', 'No title')}")
-        print(f"Feed description: {getattr(feed.feed, 'description', 'No description')}")
-        print(f"Bozo: {feed.bozo}")
-        print(f"Number of entries: {len(feed.entries)}")
-        
-        if feed.bozo:
-            print(f"Bozo exception: {feed.bozo_exception}")
-        
+            out.write(f"Requests failed, trying feedparser directly: {req_error}\n")
+            feed_info, entries, entry_count = _parse_with_feedparser(url)
+
+        out.write(f"Feed title: {feed_info['title'] or 'No title'}\n")
+        out.write(f"Feed description: {feed_info['description'] or 'No description'}\n")
+        out.write(f"Bozo: {feed_info['bozo']}\n")
+        out.write(f"Number of entries: {entry_count}\n")
+
+        if feed_info['bozo']:
+            out.write(f"Bozo exception: {feed_info['bozo_exception']}\n")
+
         # Test first few entries
-        for i, entry in enumerate(feed.entries[:3]):
-            print(f"\n--- Entry {i+1} ---")
-            print(f"Title: {getattr(entry, 'title', 'No title')}")
-            print(f"Link: {getattr(entry, 'link', 'No link')}")
-            print(f"Summary: {getattr(entry, 'summary', 'No summary')[:100]}...")
-            
+        for i, entry in enumerate(entries):
+            out.write(f"\n--- Entry {i+1} ---\n")
+            out.write(f"Title: {entry['title'] or 'No title'}\n")
+            out.write(f"Link: {entry['link'] or 'No link'}\n")
+            out.write(f"Summary: {(entry['summary'] or 'No summary')[:100]}...\n")
+
             # Check publication date
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                published = datetime(*entry.published_parsed[:6])
-                print(f"Published (parsed): {published}")
-            elif hasattr(entry, 'published'):
-                print(f"Published (raw): {entry.published}")
+            if entry['published']:
+                out.write(f"Published: {entry['published'].strip()}\n")
             else:
-                print("No publication date")
-            
+                out.write("No publication date\n")
+
             # Check content
-            if hasattr(entry, 'content') and entry.content:
-                content = entry.content[0].value if isinstance(entry.content, list) else entry.content
-                print(f"Content: {content[:100]}...")
-            elif hasattr(entry, 'description'):
-                print(f"Description: {entry.description[:100]}...")
+            if entry['content']:
+                out.write(f"Content: {entry['content'][:100]}...\n")
             else:
-                print("No content/description")
-                
+                out.write("No content/description\n")
+
     except Exception as e:
-        print(f"Error parsing feed: {e}")
+        out.write(f"Error parsing feed: {e}\n")
+
+    return out.getvalue()
 
 if __name__ == "__main__":
     # Test RSS feeds from updated config
@@ -73,6 +258,10 @@ if __name__ == "__main__":
         "https://www.billboard.com/feed/",
         "https://www.theverge.com/rss/index.xml",
     ]
-    
-    for feed_url in test_feeds:
-        test_rss_feed(feed_url)
+
+    # Feeds are fetched concurrently; reports are printed in the original order
+    with ThreadPoolExecutor(max_workers=min(8, len(test_feeds))) as executor:
+        for report in executor.map(test_rss_feed, test_feeds):
+            print(report)
+
+    _save_feed_cache(_FEED_CACHE)
@@ -0,0 +1,109 @@
+"""
+On-disk cache of document embeddings keyed by a hash of the model and input text.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+import zstandard as zstd
+from loguru import logger
+
+# SQLite caps the number of bound parameters per statement
+_SQLITE_MAX_PARAMS = 500
+
+# Frame header written at the start of every zstd blob
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+class DiskEmbeddingCache:
+    """SQLite-backed store of zstd-compressed float16 embedding vectors."""
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Location of the SQLite database file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        # Reused across calls; zstd contexts are not thread-safe, so they are only used under the lock
+        self._compressor = zstd.ZstdCompressor(level=3)
+        self._decompressor = zstd.ZstdDecompressor()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        logger.info(f"Opened embedding cache at {path}")
+
+    @staticmethod
+    def make_key(model: str, text: str) -> bytes:
+        """Build the cache key for a text embedded with the given model."""
+        return hashlib.sha1((model + "\x00" + text).encode("utf-8")).digest()
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, np.ndarray]:
+        """
+        Look up cached vectors.
+
+        Args:
+            keys: Cache keys built with make_key
+
+        Returns:
+            Mapping of key to float32 vector for every key present in the cache
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        found: Dict[bytes, np.ndarray] = {}
+
+        with self._lock:
+            for i in range(0, len(unique_keys), _SQLITE_MAX_PARAMS):
+                chunk = unique_keys[i:i + _SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT hash, vec FROM embeddings WHERE hash IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[bytes(key)] = self._decode(blob)
+
+        return found
+
+    def put_many(self, items: Iterable[Tuple[bytes, np.ndarray]]) -> None:
+        """
+        Store vectors, replacing any existing entries with the same key.
+
+        Args:
+            items: (key, vector) pairs
+        """
+        items = list(items)
+        if not items:
+            return
+
+        with self._lock:
+            rows = [
+                (key, self._compressor.compress(np.asarray(vector, dtype=np.float16).tobytes()))
+                for key, vector in items
+            ]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (hash, vec) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
+
+    def _decode(self, blob: bytes) -> np.ndarray:
+        """Turn a stored blob back into a float32 vector (caller holds the lock)."""
+        blob = bytes(blob)
+        # Rows written before compression was added hold raw float16 bytes
+        if blob.startswith(_ZSTD_MAGIC):
+            blob = self._decompressor.decompress(blob)
+        return np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,11 +1,18 @@
 """
 Embeddings module for generating vector representations of news articles using Cohere.
 """
+import atexit
+import threading
 import cohere
-import time
-from typing import List, Dict, Any
+import httpx
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional
+from cachetools import LRUCache
 from loguru import logger
 from config import get_settings
+from embedding_cache import DiskEmbeddingCache
+from rate_limiter import TokenBucket
 
 settings = get_settings()
 
@@ -18,11 +25,25 @@ class EmbeddingGenerator:
         if not settings.cohere_api_key:
             raise ValueError("COHERE_API_KEY environment variable is required")
         
-        self.client = cohere.Client(settings.cohere_api_key)
+        # One keep-alive HTTP/2 pool shared by every embed call, sized for the batch workers
+        self._httpx = httpx.Client(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=settings.cohere_parallelism,
+                max_keepalive_connections=settings.cohere_parallelism
+            )
+        )
+        self.client = cohere.Client(api_key=settings.cohere_api_key, httpx_client=self._httpx)
         self.model = settings.embedding_model
+        self.rate_limiter = TokenBucket(settings.cohere_tokens_per_minute)
+        self.cache = DiskEmbeddingCache(settings.embedding_cache_path) if settings.embedding_cache_path else None
+        # Query embeddings by normalized text; a query's vector never changes for a given model
+        self._query_cache: LRUCache = LRUCache(maxsize=settings.query_embedding_cache_size)
+        self._query_cache_lock = threading.Lock()
         logger.info(f"Initialized EmbeddingGenerator with model: {self.model}")
     
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for a list of texts with rate limiting for trial accounts.
 
@@ -30,49 +51,103 @@ class EmbeddingGenerator:
             texts: List of text strings to embed
 
         Returns:
-            List of embedding vectors
+            float32 array of shape (len(texts), dimension), one row per text
         """
         try:
             if not texts:
-                return []
+                return np.empty((0, settings.embedding_dimension), dtype=np.float32)
 
             # For trial accounts, process in smaller batches with rate limiting
             # Trial limit: 100,000 tokens per minute
             # Estimate ~100 tokens per 75 words, so ~1000 tokens per article
             max_batch_size = settings.cohere_batch_size
-            delay_between_batches = settings.cohere_rate_limit_delay
 
-            all_embeddings = []
+            # Preallocate so results land in input order regardless of completion order
+            all_embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
+
+            # Serve unchanged texts from the disk cache and only embed the misses
+            keys = [DiskEmbeddingCache.make_key(self.model, text) for text in texts]
+            if self.cache:
+                cached = self.cache.get_many(keys)
+                hits = 0
+                for i, key in enumerate(keys):
+                    if key in cached:
+                        all_embeddings[i] = cached[key]
+                        hits += 1
+                logger.info(f"Embedding cache: {hits}/{len(texts)} hits")
+
+            # Exact duplicates (e.g. the same wire story from several feeds) are embedded once
+            unique_misses: Dict[bytes, int] = {}
+            for i, embedding in enumerate(all_embeddings):
+                if embedding is None:
+                    unique_misses.setdefault(keys[i], i)
+
+            if unique_misses:
+                logger.info(f"Embedding {len(unique_misses)} unique texts")
+
+            miss_keys = list(unique_misses)
+            miss_texts = [texts[unique_misses[key]] for key in miss_keys]
+            batches = [(i, miss_texts[i:i + max_batch_size]) for i in range(0, len(miss_texts), max_batch_size)]
+            embedded: Dict[bytes, np.ndarray] = {}
+
+            max_workers = max(1, min(settings.cohere_parallelism, len(batches)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(self._embed_batch, batch, offset // max_batch_size + 1): offset
+                    for offset, batch in batches
+                }
+
+                for future in as_completed(futures):
+                    offset = futures[future]
+                    batch_embeddings = future.result()
+                    batch_keys = miss_keys[offset:offset + len(batch_embeddings)]
+                    embedded.update(zip(batch_keys, batch_embeddings))
+
+                    if self.cache:
+                        self.cache.put_many(zip(batch_keys, batch_embeddings))
+
+            # Scatter results back to every position that shared a text
+            for i, embedding in enumerate(all_embeddings):
+                if embedding is None:
+                    all_embeddings[i] = embedded[keys[i]]
 
-            for i in range(0, len(texts), max_batch_size):
-                batch = texts[i:i + max_batch_size]
+            logger.info(f"Successfully generated {len(all_embeddings)} total embeddings")
+            return np.vstack(all_embeddings)
 
-                logger.info(f"Generating embeddings for batch {i//max_batch_size + 1}: {len(batch)} texts")
+        except Exception as e:
+            logger.error(f"Error generating embeddings: {str(e)}")
+            raise
 
-                # Add delay between batches to respect rate limits
-                if i > 0:
-                    logger.info(f"Rate limiting: waiting {delay_between_batches} seconds...")
-                    time.sleep(delay_between_batches)
+    def _embed_batch(self, batch: List[str], batch_number: int) -> np.ndarray:
+        """
+        Embed a single batch of documents once the rate limiter has capacity.
 
-                response = self.client.embed(
-                    texts=batch,
-                    model=self.model,
-                    input_type="search_document"
-                )
+        Args:
+            batch: Text strings to embed in one API call
+            batch_number: 1-based batch index, used for logging
 
-                batch_embeddings = response.embeddings
-                all_embeddings.extend(batch_embeddings)
+        Returns:
+            float32 array with one embedding row per text, in input order
+        """
+        # Rough token estimate (~4 characters per token) for the per-minute budget
+        estimated_tokens = sum(len(text) for text in batch) // 4 + 1
+        waited = self.rate_limiter.acquire(estimated_tokens)
+        if waited > 0:
+            logger.info(f"Rate limiting: waited {waited:.1f} seconds before batch {batch_number}")
 
-                logger.info(f"Successfully generated {len(batch_embeddings)} embeddings for batch")
+        logger.info(f"Generating embeddings for batch {batch_number}: {len(batch)} texts")
 
-            logger.info(f"Successfully generated {len(all_embeddings)} total embeddings")
-            return all_embeddings
+        response = self.client.embed(
+            texts=batch,
+            model=self.model,
+            input_type="search_document"
+        )
 
-        except Exception as e:
-            logger.error(f"Error generating embeddings: {str(e)}")
-            raise
-    
-    def generate_query_embedding(self, query: str) -> List[float]:
+        batch_embeddings = np.asarray(response.embeddings, dtype=np.float32)
+        logger.info(f"Successfully generated {len(batch_embeddings)} embeddings for batch {batch_number}")
+        return batch_embeddings
+
+    def generate_query_embedding(self, query: str) -> np.ndarray:
         """
         Generate embedding for a search query.
         
@@ -80,8 +155,15 @@ class EmbeddingGenerator:
             query: Search query string
             
         Returns:
-            Embedding vector for the query
+            L2-normalized float32 embedding vector for the query, so cosine
+            similarity against normalized rows is a plain dot product
         """
+        cache_key = ' '.join(query.split())
+        with self._query_cache_lock:
+            cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            return cached.copy()
+
         try:
             logger.info(f"Generating query embedding for: {query}")
             
@@ -91,15 +173,26 @@ class EmbeddingGenerator:
                 input_type="search_query"
             )
             
-            embedding = response.embeddings[0]
+            embedding = np.asarray(response.embeddings[0], dtype=np.float32)
+            norm = np.linalg.norm(embedding)
+            if norm > 0:
+                embedding /= norm
             logger.info("Successfully generated query embedding")
-            
-            return embedding
+
+            with self._query_cache_lock:
+                self._query_cache[cache_key] = embedding
+            return embedding.copy()
             
         except Exception as e:
             logger.error(f"Error generating query embedding: {str(e)}")
             raise
     
+    def close(self) -> None:
+        """Release the pooled HTTP connections and the embedding cache."""
+        self._httpx.close()
+        if self.cache:
+            self.cache.close()
+
     def prepare_text_for_embedding(self, article: Dict[str, Any]) -> str:
         """
         Prepare article text for embedding by combining title, summary, and content.
@@ -115,23 +208,31 @@ class EmbeddingGenerator:
         content = article.get("content", "")
         
         # Combine title, summary, and content with appropriate weighting
-        combined_text = f"Title: {title}\n\nSummary: {summary}\n\nContent: {content}"
-        
-        # Truncate if too long (Cohere has token limits)
-        max_chars = 8000  # Conservative limit
-        if len(combined_text) > max_chars:
-            combined_text = combined_text[:max_chars] + "..."
-        
-        return combined_text
+        prefix = f"Title: {title}\n\nSummary: {summary}\n\nContent: "
+
+        # Truncate content before concatenating (Cohere has token limits);
+        # the budget is a rough ~4 characters per token estimate
+        max_chars = settings.cohere_max_tokens * 4
+        budget = max(0, max_chars - len(prefix))
+        if len(content) > budget:
+            content = content[:max(0, budget - 3)] + "..."
+
+        # A long title or summary can use up the budget on its own, so cap the combined text too
+        return (prefix + content)[:max_chars]
 
 
 # Global embedding generator instance
 embedding_generator = None
+_embedding_generator_lock = threading.Lock()
 
 
 def get_embedding_generator() -> EmbeddingGenerator:
     """Get or create the global embedding generator instance."""
     global embedding_generator
     if embedding_generator is None:
-        embedding_generator = EmbeddingGenerator()
+        with _embedding_generator_lock:
+            # Re-check: another thread may have finished construction while this one waited
+            if embedding_generator is None:
+                embedding_generator = EmbeddingGenerator()
+                atexit.register(embedding_generator.close)
     return embedding_generator
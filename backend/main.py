@@ -1,13 +1,17 @@
 """
 FastAPI main application for DS Task AI News.
 """
+import asyncio
+import os
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from typing import Optional
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from loguru import logger
+import orjson
 
 try:
     # Try absolute imports first (when run directly or from root)
@@ -40,6 +44,18 @@ if frontend_dir.exists():
 else:
     logger.warning(f"Frontend directory not found at: {frontend_dir}")
 
+@app.on_event("startup")
+async def warm_up_services():
+    """Create the vector store and recommender singletons before the first request."""
+    try:
+        # Client setup talks to Pinecone/Cohere, so keep it off the event loop
+        await asyncio.to_thread(get_vector_store)
+        await asyncio.to_thread(get_news_recommender)
+        logger.info("Vector store and recommender initialized")
+    except Exception as e:
+        # Serve anyway; the endpoints retry initialization on demand
+        logger.warning(f"Could not initialize services at startup: {e}")
+
 @app.get("/")
 async def serve_frontend():
     """Serve the frontend index.html at the root path."""
@@ -68,24 +84,21 @@ async def recommend_news(article_id: str, max_results: Optional[int] = None):
 
         # Get the recommender
         recommender = get_news_recommender()
-        vector_store = get_vector_store()
-
-        # First, get the source article to create a meaningful query description
-        source_article = vector_store.get_article_by_id(article_id)
-        if not source_article:
-            logger.warning(f"Article with ID {article_id} not found")
-            raise HTTPException(status_code=404, detail=f"Article with ID '{article_id}' not found")
 
-        # Get similar articles
-        raw_articles = recommender.get_similar_articles(
+        # Source article and similar articles come back from a single vector store query;
+        # the call is blocking, so keep it off the event loop
+        source_article, raw_articles = await asyncio.to_thread(
+            recommender.get_similar_articles_with_source,
             article_id=article_id,
             max_results=max_results
         )
+        if not source_article:
+            logger.warning(f"Article with ID {article_id} not found")
+            raise HTTPException(status_code=404, detail=f"Article with ID '{article_id}' not found")
 
         # Format articles to match the expected frontend structure
-        formatted_articles = []
-        for article in raw_articles:
-            formatted_article = {
+        formatted_articles = [
+            {
                 "id": article.get('id', ''),
                 "title": article.get('title', ''),
                 "content": article.get('content_preview', ''),
@@ -99,7 +112,8 @@ async def recommend_news(article_id: str, max_results: Optional[int] = None):
                 "slug": '',
                 "similarity_score": article.get('similarity_score', 0)
             }
-            formatted_articles.append(formatted_article)
+            for article in raw_articles
+        ]
 
         return {
             "articles": formatted_articles,
@@ -114,36 +128,69 @@ async def recommend_news(article_id: str, max_results: Optional[int] = None):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def format_article_with_id(article: dict) -> dict:
-    """Format article with uniform ID generation using MD5 hash."""
-    import hashlib
-    import re
+def _name_timestamp(name: str) -> str:
+    """
+    Sortable timestamp from a processed file name.
+
+    Keeps only the digits, so YYYY_MM_DD_HH_MM and YYYYMMDD_HHMMSS names
+    compare chronologically; padded to seconds precision.
+    """
+    digits = "".join(ch for ch in name if ch.isdigit())
+    return digits.ljust(14, "0")
+
+
+def _locate_latest_file() -> tuple[Optional[Path], float, int]:
+    """
+    Find the most recent processed articles file.
+
+    Looks in the data/processed_news directory for timestamped processed files
+    (processed_news_YYYY_MM_DD_HH_MM.json, named after their raw file), API
+    article files, and the legacy latest_articles.json format.
+
+    Files are ranked by the timestamp in their name rather than by mtime:
+    raw files are processed in parallel and finish in any order, so the
+    newest raw batch is not necessarily the last file written.
+
+    Returns:
+        Tuple of (latest_file_or_None, its_mtime, number_of_candidate_files)
+    """
+    processed_dir = Path(settings.processed_news_dir)
+
+    # One directory scan; DirEntry caches stat results, so no extra syscalls per file
+    candidates = []
+    if processed_dir.is_dir():
+        with os.scandir(processed_dir) as entries:
+            candidates = [
+                (_name_timestamp(entry.name), entry.stat().st_mtime, entry.path)
+                for entry in entries
+                if entry.name.endswith(".json")
+                and entry.name.startswith(("processed_news_", "api_articles_"))
+                and entry.is_file()
+            ]
+
+    # Fallback to legacy latest_articles.json if no timestamped files found
+    legacy_file = processed_dir / "latest_articles.json"
+    if not candidates and legacy_file.exists():
+        candidates = [("", legacy_file.stat().st_mtime, str(legacy_file))]
+
+    if not candidates:
+        return None, 0.0, 0
 
-    # Generate uniform ID: {source_name}_{md5_hash}
-    content_hash = hashlib.md5(
-        f"{article.get('title', '')}{article.get('url', article.get('link', ''))}".encode()
-    ).hexdigest()
+    # Newest name timestamp wins; mtime only breaks ties
+    _, mtime, path = max(candidates)
+    return Path(path), mtime, len(candidates)
 
-    # Extract and clean source name
-    source_feed = article.get('source_feed', article.get('source_url', 'unknown'))
-    source_name = source_feed.split('/')[-1].replace('.xml', '').replace('.rss', '').replace('.', '_')
-    source_name = re.sub(r'[^a-zA-Z0-9_]', '_', source_name)
 
-    article_id = f"{source_name}_{content_hash}"
+@lru_cache(maxsize=4)
+def _load_articles(path: str, mtime: float) -> list:
+    """
+    Parse a processed articles file.
 
-    return {
-        "id": article_id,
-        "title": article.get('title', ''),
-        "content": article.get('content', ''),
-        "date": article.get('date', article.get('published', '')),
-        "url": article.get('url', article.get('link', '')),
-        "source": article.get('source_feed', article.get('source_url', '')),
-        "categories": article.get('categories', [article.get('category', 'general')] if article.get('category') else []),
-        "tags": article.get('tags', []),
-        "summary": article.get('summary', ''),
-        "author": article.get('author', ''),
-        "slug": article.get('slug', '')
-    }
+    The modification time is part of the cache key, so rewriting the file
+    (e.g. a new pipeline run) naturally invalidates the cached entry.
+    """
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
 
 
 def get_latest_processed_articles() -> tuple[list, dict]:
@@ -151,48 +198,21 @@ def get_latest_processed_articles() -> tuple[list, dict]:
     Load the latest processed articles from the pipeline output.
 
     Looks for the most recent processed file in the data/processed_news directory.
-    Supports both timestamped files (processed_news_YYYYMMDD_HHMMSS.json)
+    Supports both timestamped files (processed_news_YYYY_MM_DD_HH_MM.json)
     and the legacy latest_articles.json format.
 
     Returns:
         Tuple of (articles_list, metadata_dict)
     """
-    import json
-    import glob
-    from pathlib import Path
+    latest_file, last_modified, available_files = _locate_latest_file()
 
-    processed_dir = Path(settings.processed_news_dir)
-
-    # First, try to find timestamped processed files
-    processed_pattern = str(processed_dir / "processed_news_*.json")
-    processed_files = glob.glob(processed_pattern)
-
-    # Also check for API articles files
-    api_pattern = str(processed_dir / "api_articles_*.json")
-    api_files = glob.glob(api_pattern)
-
-    # Combine all processed files
-    all_files = processed_files + api_files
-
-    # Fallback to legacy latest_articles.json if no timestamped files found
-    legacy_file = processed_dir / "latest_articles.json"
-    if not all_files and legacy_file.exists():
-        all_files = [str(legacy_file)]
-
-    if not all_files:
+    if latest_file is None:
         logger.warning("No processed articles found. Please run the pipeline first: python pipeline.py")
         return [], {"error": "No processed articles available", "last_processed": None}
 
-    # Sort files by modification time (most recent first)
-    all_files.sort(key=lambda x: Path(x).stat().st_mtime, reverse=True)
-    latest_file = Path(all_files[0])
-
     try:
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            articles = json.load(f)
-
-        # Get file modification time for metadata
-        last_modified = latest_file.stat().st_mtime
+        # The modification time doubles as metadata and the parse cache key
+        articles = _load_articles(str(latest_file), last_modified)
         last_processed = datetime.fromtimestamp(last_modified).isoformat()
 
         metadata = {
@@ -200,7 +220,7 @@ def get_latest_processed_articles() -> tuple[list, dict]:
             "last_processed": last_processed,
             "source_file": str(latest_file),
             "pipeline_required": False,
-            "available_files": len(all_files)
+            "available_files": available_files
         }
 
         logger.info(f"Loaded {len(articles)} processed articles from {latest_file}")
@@ -211,7 +231,26 @@ def get_latest_processed_articles() -> tuple[list, dict]:
         return [], {"error": str(e), "last_processed": None}
 
 
-@app.get("/fetch-news")
+# Load currently in flight, shared by concurrent /fetch-news callers
+_latest_articles_load: Optional[asyncio.Future] = None
+
+
+async def _load_latest_single_flight() -> tuple[list, dict]:
+    """
+    Run get_latest_processed_articles off the event loop, once per burst of callers.
+
+    Requests that arrive while a load is running await that same load instead
+    of starting their own. No lock is needed: the check-and-set below has no
+    await in between, so it cannot interleave on the event loop.
+    """
+    global _latest_articles_load
+    if _latest_articles_load is None or _latest_articles_load.done():
+        _latest_articles_load = asyncio.ensure_future(asyncio.to_thread(get_latest_processed_articles))
+    # Shield so one client disconnecting does not cancel the load for the others
+    return await asyncio.shield(_latest_articles_load)
+
+
+@app.get("/fetch-news", response_class=ORJSONResponse)
 async def fetch_news():
     """
     Fetch latest processed news articles from the pipeline output.
@@ -223,7 +262,7 @@ async def fetch_news():
         logger.info("News fetch requested - loading from processed files")
 
         # Load processed articles from pipeline output
-        articles, metadata = get_latest_processed_articles()
+        articles, metadata = await _load_latest_single_flight()
 
         if metadata.get("error"):
             raise HTTPException(
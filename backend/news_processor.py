@@ -1,50 +1,74 @@
 """
 News processing module for cleaning, enhancing, and preparing articles for vector storage.
 """
-import json
+import asyncio
 import hashlib
-import time
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from pathlib import Path
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 
-import html2text
 from bs4 import BeautifulSoup
-from groq import Groq
+from lxml import etree, html as lxml_html
+import httpx
+from groq import APIError, AsyncGroq
 from loguru import logger
+import orjson
 
 try:
     from config import get_settings
+    from rate_limiter import TokenBucket
+    from summary_cache import SummaryCache
 except ImportError:
     try:
         from .config import get_settings
+        from .rate_limiter import TokenBucket
+        from .summary_cache import SummaryCache
     except ImportError:
         from backend.config import get_settings
+        from backend.rate_limiter import TokenBucket
+        from backend.summary_cache import SummaryCache
 
 settings = get_settings()
 
+# Whitespace normalisation applied to every cleaned article
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')
+_SPACES_RE = re.compile(r'[ \t]+')
+
+# Characters not allowed in the source-name prefix of an article ID
+_NON_ID_RE = re.compile(r'[^a-zA-Z0-9_]')
+
+# Elements whose end marks a paragraph break in the extracted text
+_BLOCK_TAGS = (
+    'p', 'div', 'br', 'li', 'ul', 'ol', 'tr', 'table', 'blockquote', 'pre',
+    'section', 'article', 'header', 'footer', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+)
+
 
 class NewsProcessor:
     """Handles processing of raw news articles into clean, enhanced format."""
     
     def __init__(self):
-        """Initialize the news processor with Groq client."""
-        self.groq_client = None
-        if settings.groq_api_key:
-            try:
-                self.groq_client = Groq(api_key=settings.groq_api_key)
-                logger.info("Initialized NewsProcessor with Groq client")
-            except Exception as e:
-                logger.warning(f"Failed to initialize Groq client: {e}")
+        """Initialize the news processor and its Groq rate limiters."""
+        # Async Groq clients are created per summarization run (see generate_summaries_batch_async)
+        self.groq_enabled = bool(settings.groq_api_key)
+        if self.groq_enabled:
+            logger.info("Initialized NewsProcessor with Groq summarization")
         else:
             logger.warning("No Groq API key provided - AI enhancement disabled")
         
-        # Initialize HTML to text converter
-        self.html_converter = html2text.HTML2Text()
-        self.html_converter.ignore_links = True
-        self.html_converter.ignore_images = True
-        self.html_converter.body_width = 0  # Don't wrap lines
+        # Groq enforces both requests and tokens per minute; a call waits until both allow it
+        self.request_limiter = TokenBucket(settings.groq_requests_per_minute)
+        self.token_limiter = TokenBucket(settings.groq_tokens_per_minute)
+        self.summary_cache = SummaryCache(settings.summary_cache_path) if settings.summary_cache_path else None
+        # One bounded pool for content cleaning, shared by every file processed in parallel.
+        # The work is mostly Python under the GIL, so a few threads are enough to overlap lxml parsing.
+        self._cleaning_pool = ThreadPoolExecutor(
+            max_workers=max(1, settings.cleaning_workers), thread_name_prefix="clean"
+        )
         
     def process_raw_news_files(self) -> List[str]:
         """
@@ -71,13 +95,24 @@ class NewsProcessor:
         raw_files = [f for f in all_json_files if f.name.startswith("raw_news_")]
         logger.info(f"Found {len(raw_files)} raw news files to process (excluded {len(all_json_files) - len(raw_files)} non-article files)")
         
-        for raw_file in raw_files:
-            try:
-                processed_file = self._process_single_file(raw_file, processed_dir)
-                if processed_file:
-                    processed_files.append(processed_file)
-            except Exception as e:
-                logger.error(f"Error processing file {raw_file}: {e}")
+        if not raw_files:
+            return processed_files
+
+        # Files are independent: while one waits on Groq, another can be loaded and cleaned.
+        # The rate limiters are shared by the processor, so the Groq budget still holds across files.
+        workers = max(1, min(settings.processing_workers, len(raw_files)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._process_single_file, raw_file, processed_dir): raw_file
+                for raw_file in sorted(raw_files)
+            }
+            for future, raw_file in futures.items():
+                try:
+                    processed_file = future.result()
+                    if processed_file:
+                        processed_files.append(processed_file)
+                except Exception as e:
+                    logger.error(f"Error processing file {raw_file}: {e}")
         
         logger.info(f"Successfully processed {len(processed_files)} files")
         return processed_files
@@ -95,8 +130,8 @@ class NewsProcessor:
         """
         try:
             # Load raw articles
-            with open(raw_file, 'r', encoding='utf-8') as f:
-                raw_articles = json.load(f)
+            with open(raw_file, 'rb') as f:
+                raw_articles = orjson.loads(f.read())
             
             if not raw_articles:
                 logger.warning(f"No articles found in {raw_file}")
@@ -107,14 +142,17 @@ class NewsProcessor:
             # Process articles with batch AI enhancement
             processed_articles = self._process_articles_batch(raw_articles)
             
-            # Generate processed filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Name the output after its raw file so files processed in parallel never collide
+            timestamp = raw_file.stem[len("raw_news_"):] or datetime.now().strftime("%Y%m%d_%H%M%S")
             processed_filename = f"processed_news_{timestamp}.json"
             processed_filepath = processed_dir / processed_filename
             
-            # Save processed articles
-            with open(processed_filepath, 'w', encoding='utf-8') as f:
-                json.dump(processed_articles, f, indent=2, ensure_ascii=False)
+            # Save processed articles; write a temp file and rename it into place so the API,
+            # which serves the newest processed file, never reads a half-written one
+            tmp_filepath = processed_filepath.with_name(processed_filename + ".tmp")
+            with open(tmp_filepath, 'wb') as f:
+                f.write(orjson.dumps(processed_articles, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            os.replace(tmp_filepath, processed_filepath)
             
             logger.info(f"Saved {len(processed_articles)} processed articles to {processed_filepath}")
             return str(processed_filepath)
@@ -133,23 +171,59 @@ class NewsProcessor:
         Returns:
             List of processed articles with AI summaries
         """
-        processed_articles = []
-
-        # Step 1: Process articles without AI (ID generation, content cleaning)
-        articles_for_ai = []
-        for article in raw_articles:
-            processed_article = self._process_single_article_without_ai(article)
-            if processed_article:
-                processed_articles.append(processed_article)
-                articles_for_ai.append(processed_article)
+        # Step 1: Process articles without AI (ID generation, content cleaning) on the shared pool
+        processed_articles = [
+            article for article in self._cleaning_pool.map(self._process_single_article_without_ai, raw_articles)
+            if article
+        ]
+        articles_for_ai = list(processed_articles)
 
         # Step 2: Generate AI summaries in batches
-        if self.groq_client and articles_for_ai:
-            logger.info(f"Generating AI summaries for {len(articles_for_ai)} articles using batch processing")
-            self._generate_summaries_batch(articles_for_ai)
+        if self.groq_enabled and articles_for_ai:
+            if self.summary_cache:
+                self._generate_summaries_cached(articles_for_ai)
+            else:
+                logger.info(f"Generating AI summaries for {len(articles_for_ai)} articles using batch processing")
+                self._generate_summaries_batch(articles_for_ai)
 
         return processed_articles
 
+    def _generate_summaries_cached(self, articles: List[Dict[str, Any]]) -> None:
+        """
+        Reuse summaries for articles whose title and content were summarized before,
+        then generate (and cache) the rest.
+
+        Args:
+            articles: List of processed articles to generate summaries for
+        """
+        keys = [SummaryCache.make_key(article['title'], article['content']) for article in articles]
+        cached = self.summary_cache.get_many(keys)
+
+        # Identical articles within the run are only sent once
+        pending: Dict[bytes, List[Dict[str, Any]]] = {}
+        for key, article in zip(keys, articles):
+            if key in cached:
+                article['ai_summary'] = cached[key]
+            else:
+                pending.setdefault(key, []).append(article)
+
+        logger.info(f"Summary cache: {len(articles) - sum(map(len, pending.values()))}/{len(articles)} hits")
+        if not pending:
+            return
+
+        to_summarize = [group[0] for group in pending.values()]
+        logger.info(f"Generating AI summaries for {len(to_summarize)} articles using batch processing")
+        self._generate_summaries_batch(to_summarize)
+
+        generated = []
+        for key, group in pending.items():
+            summary = group[0].get('ai_summary')
+            if summary:
+                generated.append((key, summary))
+                for duplicate in group[1:]:
+                    duplicate['ai_summary'] = summary
+        self.summary_cache.put_many(generated)
+
     def _process_single_article_without_ai(self, article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Process a single article without AI enhancement (for batch processing).
@@ -167,10 +241,13 @@ class NewsProcessor:
             # Clean content
             cleaned_content = self._clean_content(article.get('content', ''))
 
+            title = article.get('title', '')
+            stripped_title = title.strip()
+
             # Create base processed article
             processed_article = {
                 'id': unique_id,
-                'title': article.get('title', '').strip(),
+                'title': stripped_title,
                 'content': cleaned_content,
                 'url': article.get('url', ''),
                 'date': article.get('date', ''),
@@ -181,55 +258,17 @@ class NewsProcessor:
                 'source_feed': article.get('source_feed', '')
             }
 
+            # The ID already holds md5(title + url); keep it so the vector store need not re-hash.
+            # Only valid when stripping left the title unchanged, since downstream hashes the stripped one.
+            if title == stripped_title:
+                processed_article['content_hash'] = unique_id.rsplit('_', 1)[1]
+
             return processed_article
 
         except Exception as e:
             logger.error(f"Error processing article '{article.get('title', 'Unknown')}': {e}")
             return None
 
-    def _process_single_article(self, article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """
-        Process a single article: clean content, generate ID, enhance with AI.
-        
-        Args:
-            article: Raw article dictionary
-            
-        Returns:
-            Processed article dictionary or None if failed
-        """
-        try:
-            # Generate unique ID
-            unique_id = self._generate_article_id(article)
-            
-            # Clean content
-            cleaned_content = self._clean_content(article.get('content', ''))
-            
-            # Create base processed article (removed metadata fields as requested)
-            processed_article = {
-                'id': unique_id,
-                'title': article.get('title', '').strip(),
-                'content': cleaned_content,
-                'url': article.get('url', ''),
-                'date': article.get('date', ''),
-                'author': article.get('author', ''),
-                'slug': article.get('slug', ''),
-                'categories': article.get('categories', []),
-                'tags': article.get('tags', []),  # Keep original tags without processing
-                'source_feed': article.get('source_feed', '')
-            }
-            
-            # Generate AI summary only (no tag/category processing)
-            if self.groq_client:
-                summary = self._generate_summary(processed_article)
-                if summary:
-                    processed_article['ai_summary'] = summary
-            
-            return processed_article
-            
-        except Exception as e:
-            logger.error(f"Error processing article '{article.get('title', 'Unknown')}': {e}")
-            return None
-    
     def _generate_article_id(self, article: Dict[str, Any]) -> str:
         """
         Generate a uniform ID for an article using MD5 hash.
@@ -242,29 +281,11 @@ class NewsProcessor:
             Unique article ID in format: source_name_md5hash
         """
         # Create hash from title and URL for consistency
-        content_for_hash = f"{article.get('title', '')}{article.get('url', '')}"
-        md5_hash = hashlib.md5(content_for_hash.encode('utf-8')).hexdigest()
-
-        # Extract source name from feed URL
-        source_feed = article.get('source_feed', 'unknown')
-        if source_feed == 'unknown':
-            source_name = 'unknown'
-        else:
-            # Extract domain or filename from URL
-            if '://' in source_feed:
-                # Extract domain name
-                domain = source_feed.split('://')[1].split('/')[0]
-                source_name = domain.replace('www.', '').replace('.com', '').replace('.', '_')
-            else:
-                # Extract filename
-                source_name = source_feed.split('/')[-1].replace('.xml', '').replace('.rss', '').replace('.', '_')
+        hasher = hashlib.md5(article.get('title', '').encode('utf-8'))
+        hasher.update(article.get('url', '').encode('utf-8'))
+        md5_hash = hasher.hexdigest()
 
-        # Clean source name to be URL-safe and ensure it's not empty
-        source_name = re.sub(r'[^a-zA-Z0-9_]', '_', source_name)
-        if not source_name or source_name == '_':
-            source_name = 'unknown'
-
-        return f"{source_name}_{md5_hash}"
+        return f"{_source_name_from_feed(article.get('source_feed', 'unknown'))}_{md5_hash}"
     
     def _clean_content(self, content: str) -> str:
         """
@@ -280,19 +301,13 @@ class NewsProcessor:
             return content
         
         try:
-            # Parse HTML with BeautifulSoup
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Convert to text using html2text
-            text = self.html_converter.handle(str(soup))
-            
+            # The fetcher already strips markup, so most content needs no parsing at all
+            if '<' in content or '&' in content:
+                content = self._html_to_text(content)
+
             # Clean up extra whitespace
-            text = re.sub(r'\n\s*\n', '\n\n', text)  # Remove excessive newlines
-            text = re.sub(r'[ \t]+', ' ', text)      # Normalize spaces
+            text = _BLANK_LINES_RE.sub('\n\n', content)  # Remove excessive newlines
+            text = _SPACES_RE.sub(' ', text)              # Normalize spaces
             text = text.strip()
             
             return text
@@ -301,72 +316,166 @@ class NewsProcessor:
             logger.warning(f"Error cleaning content: {e}")
             return content
 
+    @staticmethod
+    def _html_to_text(content: str) -> str:
+        """
+        Extract readable text from HTML in a single lxml pass.
+
+        Args:
+            content: HTML content string
+
+        Returns:
+            Text with script/style removed and block elements separated by blank lines
+        """
+        try:
+            root = lxml_html.fragment_fromstring(content, create_parent='div')
+        except (etree.ParserError, ValueError):
+            # lxml rejects a few odd inputs (e.g. encoding declarations in str)
+            soup = BeautifulSoup(content, 'lxml')
+            for element in soup(["script", "style"]):
+                element.decompose()
+            return soup.get_text(separator='\n\n', strip=True)
+
+        etree.strip_elements(root, 'script', 'style', with_tail=False)
+        for element in root.iter(*_BLOCK_TAGS):
+            element.tail = '\n\n' + element.tail if element.tail else '\n\n'
+
+        return root.text_content()
+
     def _generate_summaries_batch(self, articles: List[Dict[str, Any]]) -> None:
         """
         Generate AI summaries for multiple articles in batches to optimize Groq API usage.
 
+        Batches are sent concurrently (up to groq_max_concurrency in flight), since
+        the work is dominated by waiting on the API rather than local CPU.
+
+        Sync-only: this runs its own event loop with asyncio.run, so it must not be
+        called from a thread that is already running one (e.g. inside a FastAPI
+        handler). Await generate_summaries_batch_async there instead; worker threads
+        such as those used by asyncio.to_thread are fine.
+
         Args:
             articles: List of processed articles to generate summaries for
+
+        Raises:
+            RuntimeError: If called while an event loop is running in this thread
         """
-        if not self.groq_client:
+        if not self.groq_enabled:
             return
 
-        # Use fixed batch size of 20 articles
-        batch_size = 20
-
-        # Process articles in batches
-        for i in range(0, len(articles), batch_size):
-            batch = articles[i:i + batch_size]
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self.generate_summaries_batch_async(articles))
+            return
+        raise RuntimeError(
+            "_generate_summaries_batch cannot run inside an event loop; "
+            "await generate_summaries_batch_async instead"
+        )
 
-            try:
-                # Rate limiting - respect 30 calls per minute
-                time.sleep(settings.groq_rate_limit_delay)
+    async def generate_summaries_batch_async(self, articles: List[Dict[str, Any]]) -> None:
+        """
+        Generate AI summaries by fanning batches out over an async Groq client.
 
-                logger.info(f"Processing batch {i//batch_size + 1}: {len(batch)} articles")
+        Coroutine counterpart of _generate_summaries_batch for callers that already
+        run an event loop. Summaries are written into the article dicts in place.
 
-                # Generate summaries for the batch
-                summaries = self._generate_batch_summaries(batch)
+        Args:
+            articles: List of processed articles to generate summaries for
+        """
+        if not self.groq_enabled or not articles:
+            return
 
-                # Assign summaries back to articles
-                for j, summary in enumerate(summaries):
-                    if j < len(batch) and summary:
-                        batch[j]['ai_summary'] = summary
+        # Use fixed batch size of 20 articles
+        batch_size = 20
+        batches = [articles[i:i + batch_size] for i in range(0, len(articles), batch_size)]
+        semaphore = asyncio.Semaphore(settings.groq_max_concurrency)
+
+        # The async client's connection pool belongs to this event loop, so it lives for one run
+        async_client = AsyncGroq(
+            api_key=settings.groq_api_key,
+            max_retries=settings.groq_max_retries,
+            http_client=_groq_http_client(),
+        )
+        try:
+            await asyncio.gather(*[
+                self._process_summary_batch(async_client, semaphore, batch, batch_number)
+                for batch_number, batch in enumerate(batches, 1)
+            ])
+        finally:
+            await async_client.close()
+
+    async def _process_summary_batch(self, async_client: AsyncGroq, semaphore: asyncio.Semaphore,
+                                     batch: List[Dict[str, Any]], batch_number: int) -> None:
+        """
+        Summarize one batch and assign the summaries back to its articles.
 
-            except Exception as e:
-                logger.error(f"Error processing batch {i//batch_size + 1}: {e}")
-                # Fallback to individual processing for this batch
-                self._fallback_individual_summaries(batch)
+        Args:
+            async_client: Async Groq client shared by the run
+            semaphore: Caps the number of requests in flight
+            batch: Articles in this batch
+            batch_number: 1-based batch number for logging
+        """
+        try:
+            async with semaphore:
+                logger.info(f"Processing batch {batch_number}: {len(batch)} articles")
 
+                # Generate summaries for the batch
+                summaries = await self._generate_batch_summaries(async_client, batch)
+
+            # Assign summaries back to articles
+            for j, summary in enumerate(summaries):
+                if j < len(batch) and summary:
+                    batch[j]['ai_summary'] = summary
+
+            # The model answered but dropped some summaries; ask again for just those, in one request.
+            # An empty result means the API itself kept failing after the client's retries.
+            missing = [article for article in batch if not article.get('ai_summary')]
+            if summaries and missing:
+                logger.warning(f"Batch {batch_number}: retrying {len(missing)} missing summaries")
+                async with semaphore:
+                    retried = await self._generate_batch_summaries(async_client, missing)
+                for article, summary in zip(missing, retried):
+                    if summary:
+                        article['ai_summary'] = summary
 
+        except Exception as e:
+            logger.error(f"Error processing batch {batch_number}: {e}")
 
-    def _generate_batch_summaries(self, articles: List[Dict[str, Any]]) -> List[str]:
+    async def _generate_batch_summaries(self, async_client: AsyncGroq, articles: List[Dict[str, Any]]) -> List[str]:
         """
         Generate summaries for a batch of articles in a single API call.
 
         Args:
+            async_client: Async Groq client to send the request with
             articles: List of articles to summarize
 
         Returns:
-            List of generated summaries
+            List of generated summaries (empty if the API call failed)
         """
         target_words = (settings.summary_min_words + settings.summary_max_words) // 2
 
         # Prepare batch prompt
         batch_prompt = self._create_batch_prompt(articles, target_words)
 
+        max_tokens = int(target_words * len(articles) * 1.5)  # Buffer for all summaries
+
         try:
-            response = self.groq_client.chat.completions.create(
+            reserved = await self._wait_for_capacity_async(batch_prompt, max_tokens)
+            response = await async_client.chat.completions.create(
                 model=settings.groq_model,
                 messages=[
                     {
                         "role": "system",
-                        "content": f"You are a professional news summarizer. Create exactly {target_words} words for each summary. Respond with summaries separated by '---SUMMARY_SEPARATOR---' in the exact order requested."
+                        "content": f"You are a professional news summarizer. Create exactly {target_words} words for each summary. Respond ONLY with a JSON object of the form {{\"summaries\": [\"...\", \"...\"]}} containing exactly {len(articles)} summaries in the order requested."
                     },
                     {"role": "user", "content": batch_prompt}
                 ],
-                max_tokens=int(target_words * len(articles) * 1.5),  # Buffer for all summaries
-                temperature=0.3
+                max_tokens=max_tokens,
+                temperature=0.3,
+                response_format={"type": "json_object"}
             )
+            self._settle_tokens(reserved, response)
 
             # Parse the response to extract individual summaries
             response_text = response.choices[0].message.content.strip()
@@ -379,74 +488,41 @@ class NewsProcessor:
 
             return summaries
 
+        except APIError as e:
+            # Transient errors (429, 5xx, connection) were already retried with backoff by the client
+            logger.error(f"Groq API error in batch summary generation: {e}")
+            return []
+
         except Exception as e:
             logger.error(f"Error in batch summary generation: {e}")
             return [''] * len(articles)  # Return empty summaries on error
 
-    def _generate_summary(self, article: Dict[str, Any]) -> str:
-        """
-        Generate AI summary for an article with consistent length.
+    def _estimate_tokens(self, prompt: str, max_tokens: int) -> int:
+        """Upper-bound token cost of a request: prompt (~4 chars per token) plus the output budget."""
+        return min(len(prompt) // 4 + max_tokens, int(self.token_limiter.capacity))
 
-        Args:
-            article: Article dictionary
+    async def _wait_for_capacity_async(self, prompt: str, max_tokens: int) -> int:
+        """Wait on the event loop until the Groq request and token budgets allow another call; returns the tokens reserved."""
+        reserved = self._estimate_tokens(prompt, max_tokens)
+        await self.request_limiter.acquire_async(1)
+        await self.token_limiter.acquire_async(reserved)
+        return reserved
 
-        Returns:
-            AI-generated summary with consistent length
+    def _settle_tokens(self, reserved: int, response: Any) -> None:
         """
-        try:
-            # Rate limiting
-            time.sleep(settings.groq_rate_limit_delay)
-
-            content = article.get('content', '')
-            title = article.get('title', '')
-
-            # Truncate content if too long (Groq has token limits)
-            max_content_length = 3000
-            if len(content) > max_content_length:
-                content = content[:max_content_length] + "..."
-
-            # More specific prompt for consistent length
-            target_words = (settings.summary_min_words + settings.summary_max_words) // 2
+        Credit back the part of a reservation the request did not use.
 
-            prompt = f"""
-            Create a news summary that is EXACTLY {target_words} words long. Count your words carefully.
+        The reservation assumes the whole max_tokens budget is generated; the
+        real usage reported by Groq is usually far lower, so returning the
+        difference lets the next batches start sooner.
 
-            Title: {title}
-
-            Content: {content}
-
-            Requirements:
-            - EXACTLY {target_words} words (no more, no less)
-            - Capture the main points and key information
-            - Be objective and factual
-            - Use clear, readable language
-            - Do not include any introductory phrases like "This article discusses" or "The summary is"
-            - Start directly with the content
-
-            Write your {target_words}-word summary:
-            """
-
-            response = self.groq_client.chat.completions.create(
-                model=settings.groq_model,
-                messages=[
-                    {"role": "system", "content": f"You are a professional news summarizer. You MUST create summaries that are exactly {target_words} words long. Count your words carefully and ensure the exact word count."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=int(target_words * 1.5),  # Allow some buffer for token conversion
-                temperature=0.3  # Lower temperature for more consistent output
-            )
-
-            summary = response.choices[0].message.content.strip()
-
-            # Log word count for monitoring
-            word_count = len(summary.split())
-            logger.debug(f"Generated summary for '{title[:50]}...' - Word count: {word_count}")
-
-            return summary
-
-        except Exception as e:
-            logger.error(f"Error generating summary: {e}")
-            return ""
+        Args:
+            reserved: Tokens taken from the bucket before the call
+            response: Chat completion response carrying usage
+        """
+        usage = getattr(response, 'usage', None)
+        if usage and usage.total_tokens:
+            self.token_limiter.release(reserved - usage.total_tokens)
 
     def _create_batch_prompt(self, articles: List[Dict[str, Any]], target_words: int) -> str:
         """
@@ -459,66 +535,57 @@ class NewsProcessor:
         Returns:
             Formatted batch prompt
         """
-        prompt = f"""Create news summaries for the following {len(articles)} articles. Each summary must be EXACTLY {target_words} words.
+        parts = [f"""Create news summaries for the following {len(articles)} articles. Each summary must be EXACTLY {target_words} words.
 
 IMPORTANT INSTRUCTIONS:
 - Create exactly {target_words} words for each summary
-- Separate each summary with '---SUMMARY_SEPARATOR---'
+- Return a JSON object {{"summaries": [...]}} with one string per article
 - Maintain the same order as the articles below
 - Be objective and factual
 - Start directly with content (no introductory phrases)
 
-"""
+"""]
+
+        # Truncate content to fit within token limits
+        max_content_length = settings.groq_max_content_length_per_article
 
         for i, article in enumerate(articles, 1):
             title = article.get('title', '')
             content = article.get('content', '')
-
-            # Truncate content to fit within token limits
-            max_content_length = settings.groq_max_content_length_per_article
             if len(content) > max_content_length:
                 content = content[:max_content_length] + "..."
 
-            prompt += f"""
+            parts.append(f"""
 ARTICLE {i}:
 Title: {title}
 Content: {content}
 
-"""
+""")
 
-        prompt += f"""
-Now provide exactly {target_words} words for each of the {len(articles)} articles above, separated by '---SUMMARY_SEPARATOR---':"""
+        parts.append(f"""
+Now provide exactly {target_words} words for each of the {len(articles)} articles above as {{"summaries": [...]}}:""")
 
-        return prompt
+        return ''.join(parts)
 
     def _parse_batch_response(self, response_text: str, expected_count: int) -> List[str]:
         """
         Parse batch response to extract individual summaries.
 
         Args:
-            response_text: Raw response from Groq API
+            response_text: JSON object returned by Groq in JSON mode
             expected_count: Expected number of summaries
 
         Returns:
-            List of individual summaries
+            List of individual summaries, padded with '' where the model returned too few
         """
         try:
-            # Split by separator
-            summaries = response_text.split('---SUMMARY_SEPARATOR---')
-
-            # Clean up summaries
-            cleaned_summaries = []
-            for summary in summaries:
-                cleaned = summary.strip()
-                if cleaned:
-                    cleaned_summaries.append(cleaned)
+            summaries = orjson.loads(response_text)["summaries"]
 
-            # Ensure we have the expected number of summaries
-            while len(cleaned_summaries) < expected_count:
-                cleaned_summaries.append('')  # Add empty summary for missing ones
-
-            # Truncate if we have too many
-            cleaned_summaries = cleaned_summaries[:expected_count]
+            cleaned_summaries = [
+                summary.strip() if isinstance(summary, str) else ''
+                for summary in summaries[:expected_count]
+            ]
+            cleaned_summaries.extend([''] * (expected_count - len(cleaned_summaries)))
 
             return cleaned_summaries
 
@@ -526,22 +593,56 @@ Now provide exactly {target_words} words for each of the {len(articles)} article
             logger.error(f"Error parsing batch response: {e}")
             return [''] * expected_count
 
-    def _fallback_individual_summaries(self, articles: List[Dict[str, Any]]) -> None:
-        """
-        Fallback to individual summary generation when batch processing fails.
 
-        Args:
-            articles: List of articles to process individually
-        """
-        logger.warning(f"Falling back to individual processing for {len(articles)} articles")
-
-        for article in articles:
-            try:
-                summary = self._generate_summary(article)
-                if summary:
-                    article['ai_summary'] = summary
-            except Exception as e:
-                logger.error(f"Error in fallback summary generation for '{article.get('title', 'Unknown')}': {e}")
+def _groq_http_client() -> httpx.AsyncClient:
+    """
+    Build the httpx client the async Groq SDK sends requests through.
+
+    Batches run concurrently over one connection thanks to HTTP/2 multiplexing,
+    and the pool keeps a connection alive for every request allowed in flight.
+
+    Returns:
+        Configured httpx.AsyncClient
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=settings.groq_max_concurrency * 2,
+            max_keepalive_connections=settings.groq_max_concurrency,
+        ),
+        timeout=httpx.Timeout(60.0, connect=10.0),
+    )
+
+
+@lru_cache(maxsize=256)
+def _source_name_from_feed(source_feed: str) -> str:
+    """
+    Derive the ID prefix for a feed URL (memoized: a run only sees a few dozen feeds).
+
+    Args:
+        source_feed: Feed URL the article came from
+
+    Returns:
+        URL-safe source name, or 'unknown'
+    """
+    if source_feed == 'unknown':
+        return 'unknown'
+
+    # Extract domain or filename from URL
+    if '://' in source_feed:
+        # Extract domain name
+        domain = source_feed.split('://')[1].split('/')[0]
+        source_name = domain.replace('www.', '').replace('.com', '').replace('.', '_')
+    else:
+        # Extract filename
+        source_name = source_feed.split('/')[-1].replace('.xml', '').replace('.rss', '').replace('.', '_')
+
+    # Clean source name to be URL-safe and ensure it's not empty
+    source_name = _NON_ID_RE.sub('_', source_name)
+    if not source_name or source_name == '_':
+        source_name = 'unknown'
+
+    return source_name
 
 
 def get_news_processor() -> NewsProcessor:
@@ -0,0 +1,101 @@
+"""
+Rate limiting helpers shared by the external API clients.
+"""
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to pace calls against a per-minute budget."""
+
+    def __init__(self, tokens_per_minute: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            tokens_per_minute: Budget refilled continuously over each minute
+        """
+        self.capacity = float(tokens_per_minute)
+        self.refill_rate = self.capacity / 60.0  # tokens per second
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Top up the bucket based on the time elapsed since the last refill."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_rate)
+        self._last_refill = now
+
+    def _reserve(self, tokens: float) -> float:
+        """
+        Consume tokens if available.
+
+        Returns:
+            0.0 if the tokens were taken, otherwise the seconds until they could be
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.refill_rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until the requested number of tokens is available and consume them.
+
+        Args:
+            tokens: Number of tokens the upcoming call is expected to use
+
+        Returns:
+            Seconds spent waiting for capacity
+        """
+        # A single request larger than the whole budget can never fit, so cap it
+        tokens = min(float(tokens), self.capacity)
+        waited = 0.0
+
+        while True:
+            wait_time = self._reserve(tokens)
+            if not wait_time:
+                return waited
+
+            time.sleep(wait_time)
+            waited += wait_time
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """
+        Wait on the event loop until the tokens are available and consume them.
+
+        Args:
+            tokens: Number of tokens the upcoming call is expected to use
+
+        Returns:
+            Seconds spent waiting for capacity
+        """
+        tokens = min(float(tokens), self.capacity)
+        waited = 0.0
+
+        while True:
+            wait_time = self._reserve(tokens)
+            if not wait_time:
+                return waited
+
+            await asyncio.sleep(wait_time)
+            waited += wait_time
+
+    def release(self, tokens: float) -> None:
+        """
+        Return tokens that were reserved but not used (e.g. the real cost came in under the estimate).
+
+        Args:
+            tokens: Number of tokens to credit back
+        """
+        if tokens <= 0:
+            return
+
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + tokens)
@@ -1,14 +1,73 @@
 """
 Recommender module for finding and ranking related news articles.
 """
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
 import cohere
-from typing import List, Dict, Any, Optional
+import numpy as np
+from typing import Callable, List, Dict, Any, Hashable, Optional, Tuple, TypeVar
+from cachetools import TTLCache
 from loguru import logger
 from config import get_settings
+from rate_limiter import TokenBucket
 from vector_store import get_vector_store
 
 settings = get_settings()
 
+_T = TypeVar('_T')
+
+
+class _SemanticCache:
+    """
+    Ring buffer of recent query embeddings and their results.
+
+    A new query reuses the results of an earlier one whose embedding is at
+    least `threshold` cosine-similar, so paraphrases skip the vector search
+    and re-ranking. Rows are L2-normalized, so the probe is one matrix-vector product.
+    """
+
+    def __init__(self, capacity: int, dimension: int, threshold: float, ttl: float):
+        """
+        Args:
+            capacity: Number of recent queries kept
+            dimension: Embedding dimension
+            threshold: Minimum cosine similarity for a hit
+            ttl: Seconds an entry stays valid
+        """
+        self._keys = np.zeros((capacity, dimension), dtype=np.float32)
+        # (stored_at, tag, results) per row; the tag must match exactly (max_results, data_version)
+        self._entries: List[Optional[Tuple[float, Hashable, List[Dict[str, Any]]]]] = [None] * capacity
+        self._next = 0
+        self._size = 0
+        self._threshold = threshold
+        self._ttl = ttl
+        self._lock = threading.Lock()
+
+    def get(self, embedding: np.ndarray, tag: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """Return the results of the most similar fresh query with the same tag, or None."""
+        now = time.monotonic()
+        with self._lock:
+            if not self._size:
+                return None
+
+            sims = self._keys[:self._size] @ embedding
+            candidates = np.flatnonzero(sims >= self._threshold)
+            for row in candidates[np.argsort(sims[candidates])[::-1]]:
+                stored_at, entry_tag, results = self._entries[row]
+                if entry_tag == tag and now - stored_at < self._ttl:
+                    return list(results)
+        return None
+
+    def put(self, embedding: np.ndarray, tag: Hashable, results: List[Dict[str, Any]]) -> None:
+        """Remember a query's results, overwriting the oldest entry when full."""
+        with self._lock:
+            self._keys[self._next] = embedding
+            self._entries[self._next] = (time.monotonic(), tag, list(results))
+            self._next = (self._next + 1) % len(self._entries)
+            self._size = min(self._size + 1, len(self._entries))
+
 
 class NewsRecommender:
     """Handles news recommendation using vector similarity and optional re-ranking."""
@@ -22,9 +81,80 @@ class NewsRecommender:
             self.cohere_client = None
             logger.warning("Cohere API key not provided, re-ranking will be disabled")
 
+        # Rerank calls are paced against the per-minute quota and capped in flight, so a burst of
+        # concurrent queries queues locally instead of tripping 429s and falling back to vector order
+        self._rerank_limiter = TokenBucket(settings.cohere_rerank_per_minute)
+        self._rerank_slots = threading.BoundedSemaphore(settings.cohere_rerank_concurrency)
+
         self.vector_store = get_vector_store()
+
+        # Final ranked results, keyed with the vector store's data_version so ingests invalidate them.
+        # TTLCache is not thread-safe and the API calls in from worker threads, hence the lock.
+        self._query_cache: TTLCache = TTLCache(maxsize=settings.query_cache_size, ttl=settings.query_cache_ttl)
+        self._trending_cache: TTLCache = TTLCache(maxsize=16, ttl=settings.trending_cache_ttl)
+        # Article-to-article lookups; traffic concentrates on a few hot articles
+        self._by_id_cache: TTLCache = TTLCache(maxsize=settings.similar_cache_size, ttl=settings.similar_cache_ttl)
+        self._cache_lock = threading.Lock()
+        # Lookups currently being computed, so concurrent misses on one key share a single computation
+        self._inflight: Dict[Hashable, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._semantic_cache = (
+            _SemanticCache(
+                capacity=settings.semantic_cache_size,
+                dimension=settings.embedding_dimension,
+                threshold=settings.semantic_cache_threshold,
+                ttl=settings.query_cache_ttl,
+            )
+            if settings.semantic_cache_enabled else None
+        )
         logger.info("Initialized NewsRecommender")
-    
+
+    def _cache_get(self, cache: TTLCache, key: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of a cached result list, or None on a miss."""
+        with self._cache_lock:
+            cached = cache.get(key)
+        return list(cached) if cached is not None else None
+
+    def _cache_put(self, cache: TTLCache, key: Hashable, results: List[Dict[str, Any]]) -> None:
+        """Store a result list in one of the caches."""
+        with self._cache_lock:
+            cache[key] = list(results)
+
+    def _single_flight(self, key: Hashable, compute: Callable[[], _T]) -> _T:
+        """
+        Run compute() once per key at a time.
+
+        Callers arriving while the same key is being computed wait for that
+        result (or exception) instead of issuing their own search and rerank.
+
+        Args:
+            key: Identifies the lookup
+            compute: Produces the result on a miss
+
+        Returns:
+            The result of compute(), possibly from another thread's call
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = compute()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
     def get_recommendations(self, query: str, max_results: int = None) -> List[Dict[str, Any]]:
         """
         Get news recommendations based on a text query.
@@ -41,19 +171,73 @@ class NewsRecommender:
         """
         if max_results is None:
             max_results = settings.max_recommendations
-        
+
+        cache_key = (' '.join(query.lower().split()), max_results, self.vector_store.data_version)
+        cached = self._cache_get(self._query_cache, cache_key)
+        if cached is not None:
+            logger.debug(f"Recommendation cache hit for query: {query}")
+            return cached
+
+        return list(self._single_flight(
+            ('query',) + cache_key,
+            lambda: self._recommend_and_cache(query, max_results, cache_key)
+        ))
+
+    def _recommend_and_cache(self, query: str, max_results: int, cache_key: Tuple) -> List[Dict[str, Any]]:
+        """
+        Resolve an exact-cache miss through the semantic cache or a fresh search, caching the result.
+
+        Args:
+            query: User query or interest description
+            max_results: Maximum number of recommendations to return
+            cache_key: Exact-cache key of the query
+
+        Returns:
+            List of recommended articles with scores
+        """
+        # A paraphrase of a recent query reuses its results; the embedding is needed for the search anyway
+        query_embedding = None
+        if self._semantic_cache:
+            query_embedding = self.vector_store.embedding_generator.generate_query_embedding(query)
+            cached = self._semantic_cache.get(query_embedding, cache_key[1:])
+            if cached is not None:
+                logger.debug(f"Semantic cache hit for query: {query}")
+                self._cache_put(self._query_cache, cache_key, cached)
+                return cached
+
+        recommendations = self._compute_recommendations(query, max_results, query_embedding)
+        self._cache_put(self._query_cache, cache_key, recommendations)
+        if self._semantic_cache:
+            self._semantic_cache.put(query_embedding, cache_key[1:], recommendations)
+        return recommendations
+
+    def _compute_recommendations(self, query: str, max_results: int,
+                                 query_embedding: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        Search the vector store and re-rank the results for a query (uncached).
+
+        Args:
+            query: User query or interest description
+            max_results: Maximum number of recommendations to return
+            query_embedding: Embedding of the query if already computed
+
+        Returns:
+            List of recommended articles with scores
+        """
         try:
             logger.info(f"Getting recommendations for query: {query}")
             
-            # Get initial similar articles from vector store
-            similar_articles = self.vector_store.search_similar_articles(
-                query=query,
-                n_results=max_results * 2  # Get more for re-ranking
-            )
+            # Get initial similar articles from vector store (more than needed, for re-ranking)
+            if query_embedding is not None:
+                similar_articles = self.vector_store.search_by_embedding(query_embedding, n_results=max_results * 2)
+            else:
+                similar_articles = self.vector_store.search_similar_articles(query=query, n_results=max_results * 2)
             
             if not similar_articles:
                 logger.info("No similar articles found")
                 return []
+
+            similar_articles = self._unique_by_id(similar_articles)
             
             # Re-rank articles using Cohere if available
             if self.cohere_client and len(similar_articles) > 1:
@@ -71,6 +255,22 @@ class NewsRecommender:
             logger.error(f"Error getting recommendations: {str(e)}")
             raise
     
+    @staticmethod
+    def _unique_by_id(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drop repeated article IDs, keeping the first (highest-scored) occurrence.
+
+        Done before re-ranking so Cohere is not billed twice for one article
+        and the final list never shows it twice.
+        """
+        seen = set()
+        unique = []
+        for article in articles:
+            if article['id'] not in seen:
+                seen.add(article['id'])
+                unique.append(article)
+        return unique
+
     def _rerank_articles(self, query: str, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Re-rank articles using Cohere's rerank API.
@@ -86,17 +286,16 @@ class NewsRecommender:
             logger.info(f"Re-ranking {len(articles)} articles")
             
             # Prepare documents for re-ranking
-            documents = []
-            for article in articles:
-                doc_text = f"{article['title']} {article['summary']}"
-                documents.append(doc_text)
+            documents = [f"{article['title']} {article['summary']}" for article in articles]
             
             # Use Cohere rerank
-            rerank_response = self.cohere_client.rerank(
-                model="rerank-english-v3.0",
-                query=query,
-                documents=documents
-            )
+            with self._rerank_slots:
+                self._rerank_limiter.acquire()
+                rerank_response = self.cohere_client.rerank(
+                    model="rerank-english-v3.0",
+                    query=query,
+                    documents=documents
+                )
             
             # Reorder articles based on rerank scores
             reranked_articles = []
@@ -129,34 +328,80 @@ class NewsRecommender:
         Returns:
             List of similar articles excluding the source article
         """
+        _, similar_articles = self.get_similar_articles_with_source(article_id, max_results)
+        return similar_articles
+
+    def get_similar_articles_with_source(self, article_id: str, max_results: int = None) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Get a source article together with the articles most similar to it.
+
+        The source record and its neighbors come back from one vector store
+        round-trip, and the source doubles as the re-ranking query.
+
+        Args:
+            article_id: ID of the source article to find similar articles for
+            max_results: Maximum number of similar articles to return
+
+        Returns:
+            Tuple of (source article or None if not found, similar articles excluding the source)
+        """
         if max_results is None:
             max_results = settings.max_recommendations
 
+        cache_key = (article_id, max_results, self.vector_store.data_version)
+        with self._cache_lock:
+            cached = self._by_id_cache.get(cache_key)
+        if cached is not None:
+            source_article, similar_articles = cached
+            return source_article, list(similar_articles)
+
+        def compute() -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+            result = self._compute_similar_articles_with_source(article_id, max_results)
+            # Unknown IDs are not cached, so an article shows up as soon as it is ingested
+            if result[0] is not None:
+                with self._cache_lock:
+                    self._by_id_cache[cache_key] = (result[0], list(result[1]))
+            return result
+
+        source_article, similar_articles = self._single_flight(('similar',) + cache_key, compute)
+        return source_article, list(similar_articles)
+
+    def _compute_similar_articles_with_source(self, article_id: str, max_results: int) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Query the vector store for a source article and its neighbors, re-ranking if useful (uncached).
+
+        Args:
+            article_id: ID of the source article to find similar articles for
+            max_results: Maximum number of similar articles to return
+
+        Returns:
+            Tuple of (source article or None if not found, similar articles excluding the source)
+        """
         try:
             logger.info(f"Getting similar articles for article ID: {article_id}")
 
-            # Use the optimized vector search method - no re-embedding needed!
-            similar_articles = self.vector_store.search_similar_by_id(
+            # Single query returns the source article and its neighbors - no re-embedding needed!
+            source_article, similar_articles = self.vector_store.query_with_source(
                 article_id=article_id,
-                n_results=max_results * 2,  # Get more for potential re-ranking
-                exclude_source=True  # Automatically excludes the source article
+                top_k=max_results * 2  # Get more for potential re-ranking
             )
 
+            if source_article is None:
+                return None, []
+
             if not similar_articles:
                 logger.info(f"No similar articles found for article {article_id}")
-                return []
+                return source_article, []
+
+            similar_articles = self._unique_by_id(similar_articles)
 
             # Optional: Re-rank articles using Cohere if available and beneficial
             # Note: For article-to-article similarity, vector similarity is often sufficient
             # Re-ranking is more useful for text queries than article-to-article matching
             if self.cohere_client and len(similar_articles) > max_results:
                 # Only re-rank if we have more results than needed
-                source_article = self.vector_store.get_article_by_id(article_id)
-                if source_article:
-                    query_text = f"{source_article['title']} {source_article.get('summary', '')}"
-                    reranked_articles = self._rerank_articles(query_text, similar_articles)
-                else:
-                    reranked_articles = similar_articles
+                query_text = f"{source_article['title']} {source_article.get('summary', '')}"
+                reranked_articles = self._rerank_articles(query_text, similar_articles)
             else:
                 reranked_articles = similar_articles
 
@@ -164,7 +409,7 @@ class NewsRecommender:
             final_results = reranked_articles[:max_results]
 
             logger.info(f"Returning {len(final_results)} similar articles for article {article_id}")
-            return final_results
+            return source_article, final_results
 
         except Exception as e:
             logger.error(f"Error getting similar articles for {article_id}: {str(e)}")
@@ -183,6 +428,11 @@ class NewsRecommender:
         Returns:
             List of trending topics with basic analysis
         """
+        cache_key = (limit, self.vector_store.data_version)
+        cached = self._cache_get(self._trending_cache, cache_key)
+        if cached is not None:
+            return cached
+
         try:
             logger.info("Analyzing trending topics")
 
@@ -196,26 +446,21 @@ class NewsRecommender:
                 return []
 
             # Simple trending analysis based on categories and keywords
-            category_counts = {}
-            keyword_counts = {}
-
-            for article in recent_articles:
-                # Count categories
-                category = article.get('category', 'general')
-                category_counts[category] = category_counts.get(category, 0) + 1
-
-                # Extract keywords from titles (simple approach)
-                title_words = article.get('title', '').lower().split()
-                for word in title_words:
-                    if len(word) > 4:  # Only consider longer words
-                        keyword_counts[word] = keyword_counts.get(word, 0) + 1
+            category_counts = Counter(article.get('category', 'general') for article in recent_articles)
+
+            # Extract keywords from titles (simple approach), only considering longer words
+            keyword_counts = Counter(
+                word
+                for article in recent_articles
+                for word in article.get('title', '').lower().split()
+                if len(word) > 4
+            )
 
             # Create trending topics from top categories and keywords
             trending_topics = []
 
             # Add top categories
-            sorted_categories = sorted(category_counts.items(), key=lambda x: x[1], reverse=True)
-            for category, count in sorted_categories[:limit//2]:
+            for category, count in category_counts.most_common(limit // 2):
                 trending_topics.append({
                     "topic": category.title(),
                     "description": f"Popular category with {count} recent articles",
@@ -224,8 +469,7 @@ class NewsRecommender:
                 })
 
             # Add top keywords
-            sorted_keywords = sorted(keyword_counts.items(), key=lambda x: x[1], reverse=True)
-            for keyword, count in sorted_keywords[:limit//2]:
+            for keyword, count in keyword_counts.most_common(limit // 2):
                 if len(trending_topics) < limit:
                     trending_topics.append({
                         "topic": keyword.title(),
@@ -235,7 +479,9 @@ class NewsRecommender:
                     })
 
             logger.info(f"Identified {len(trending_topics)} trending topics")
-            return trending_topics[:limit]
+            trending_topics = trending_topics[:limit]
+            self._cache_put(self._trending_cache, cache_key, trending_topics)
+            return trending_topics
 
         except Exception as e:
             logger.error(f"Error analyzing trending topics: {str(e)}")
@@ -244,11 +490,15 @@ class NewsRecommender:
 
 # Global recommender instance
 news_recommender = None
+_news_recommender_lock = threading.Lock()
 
 
 def get_news_recommender() -> NewsRecommender:
     """Get or create the global news recommender instance."""
     global news_recommender
     if news_recommender is None:
-        news_recommender = NewsRecommender()
+        with _news_recommender_lock:
+            # Re-check: another thread may have finished construction while this one waited
+            if news_recommender is None:
+                news_recommender = NewsRecommender()
     return news_recommender
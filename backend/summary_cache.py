@@ -0,0 +1,101 @@
+"""
+On-disk cache of AI summaries keyed by a hash of the article's title and content.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Tuple
+
+from loguru import logger
+
+# SQLite caps the number of bound parameters per statement
+_SQLITE_MAX_PARAMS = 500
+
+
+class SummaryCache:
+    """SQLite-backed store of generated summaries, so republished articles are not re-summarized."""
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Location of the SQLite database file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        # Summaries already looked up or stored this process, saving the DB round-trip on repeats
+        self._memo: Dict[bytes, str] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries (hash BLOB PRIMARY KEY, summary TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        logger.info(f"Opened summary cache at {path}")
+
+    @staticmethod
+    def make_key(title: str, content: str) -> bytes:
+        """Build the cache key for an article's title and cleaned content."""
+        hasher = hashlib.md5(title.encode("utf-8"))
+        hasher.update(content.encode("utf-8"))
+        return hasher.digest()
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, str]:
+        """
+        Look up cached summaries.
+
+        Args:
+            keys: Cache keys built with make_key
+
+        Returns:
+            Mapping of key to summary for every key present in the cache
+        """
+        found: Dict[bytes, str] = {}
+
+        with self._lock:
+            missing = []
+            for key in dict.fromkeys(keys):
+                if key in self._memo:
+                    found[key] = self._memo[key]
+                else:
+                    missing.append(key)
+
+            for i in range(0, len(missing), _SQLITE_MAX_PARAMS):
+                chunk = missing[i:i + _SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT hash, summary FROM summaries WHERE hash IN ({placeholders})", chunk
+                ).fetchall()
+                for key, summary in rows:
+                    found[bytes(key)] = summary
+                    self._memo[bytes(key)] = summary
+
+        return found
+
+    def put_many(self, items: Iterable[Tuple[bytes, str]]) -> None:
+        """
+        Store summaries, replacing any existing entries with the same key.
+
+        Args:
+            items: (key, summary) pairs
+        """
+        items = [(key, summary) for key, summary in items if summary]
+        if not items:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO summaries (hash, summary) VALUES (?, ?)", items
+            )
+            self._conn.commit()
+            self._memo.update(items)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,7 @@
+"""
+Pytest configuration: backend modules import each other as top-level modules.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
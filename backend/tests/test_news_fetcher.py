@@ -0,0 +1,20 @@
+"""
+Tests for HTML cleaning in the news fetcher.
+"""
+import pytest
+
+news_fetcher = pytest.importorskip("news_fetcher")
+NewsFetcher = news_fetcher.NewsFetcher
+
+
+def test_clean_html_drops_script_and_style_bodies():
+    text = "a <!-- c --> b <script>var x=1</script> <style>p {color: red}</style> <p>hi &amp; bye</p>"
+    assert NewsFetcher._clean_html(text) == "a b hi & bye"
+
+
+def test_clean_html_keeps_text_after_script():
+    assert NewsFetcher._clean_html("<p>before</p><script>x()</script> after") == "before after"
+
+
+def test_clean_html_plain_text_only_normalizes_whitespace():
+    assert NewsFetcher._clean_html("  plain\n text  ") == "plain text"
@@ -1,17 +1,153 @@
 """
 Vector store module for managing news articles in Pinecone.
 """
-from pinecone import Pinecone, ServerlessSpec
-from typing import List, Dict, Any, Optional
-import json
+from pinecone import ServerlessSpec
+from pinecone.exceptions import NotFoundException
+from pinecone.grpc import PineconeGRPC as Pinecone
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
 import hashlib
+import os
+import sqlite3
+import threading
 from datetime import datetime
+from itertools import islice
+import numpy as np
+from cachetools import TTLCache
 from loguru import logger
 from config import get_settings
 from embeddings import get_embedding_generator
 
 settings = get_settings()
 
+# SQLite caps the number of bound parameters per statement
+_SQLITE_MAX_PARAMS = 500
+
+
+def _article_link(article: Dict[str, Any]) -> str:
+    """Article URL; current articles store it as 'url', older raw files as 'link'."""
+    return article.get('link') or article.get('url', '')
+
+
+def _source_article(article_id: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Article dict for a directly looked-up article, built from its stored metadata."""
+    return {
+        'id': article_id,
+        'title': metadata.get('title', ''),
+        'link': metadata.get('link', ''),
+        'summary': metadata.get('summary', ''),
+        'content': metadata.get('content_preview', ''),
+        'published': metadata.get('published', ''),
+        'source_name': metadata.get('source_name', ''),
+    }
+
+
+def _match_to_article(match: Any) -> Dict[str, Any]:
+    """Article dict for a Pinecone query match."""
+    metadata = match.metadata
+    return {
+        'id': match.id,
+        'title': metadata.get('title', ''),
+        'link': metadata.get('link', ''),
+        'summary': metadata.get('summary', ''),
+        'published': metadata.get('published', ''),
+        'source_name': metadata.get('source_name', ''),
+        'category': metadata.get('category', 'general'),
+        'tags': metadata.get('tags', []),
+        'similarity_score': match.score,
+        'content_preview': metadata.get('content_preview', '')
+    }
+
+
+def _format_matches(matches: Iterable[Any], limit: int, exclude_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Turn Pinecone matches into article dicts, shared by every search path.
+
+    Args:
+        matches: Matches from an index query, best first
+        limit: Maximum number of articles to return
+        exclude_id: Article ID to leave out (e.g. the source of a similar-articles query)
+
+    Returns:
+        Articles scoring at least the similarity threshold, best first
+    """
+    threshold = settings.similarity_threshold
+    return [
+        _match_to_article(match)
+        for match in islice(
+            (m for m in matches if m.score >= threshold and m.id != exclude_id), limit
+        )
+    ]
+
+
+class _UpsertedIds:
+    """Local SQLite record of article IDs already upserted, per index and namespace."""
+
+    def __init__(self, path: str, index_name: str, namespace: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.index_name = index_name
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS upserted_ids (index_name TEXT NOT NULL, namespace TEXT NOT NULL, "
+            "id TEXT NOT NULL, PRIMARY KEY (index_name, namespace, id))"
+        )
+        self._conn.commit()
+
+    def known(self, ids: Iterable[str]) -> Set[str]:
+        """Return the subset of ids that were upserted before."""
+        ids = list(dict.fromkeys(ids))
+        found: Set[str] = set()
+        with self._lock:
+            for i in range(0, len(ids), _SQLITE_MAX_PARAMS):
+                chunk = ids[i:i + _SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT id FROM upserted_ids WHERE index_name = ? AND namespace = ? "
+                    f"AND id IN ({placeholders})",
+                    [self.index_name, self.namespace, *chunk]
+                ).fetchall()
+                found.update(row[0] for row in rows)
+        return found
+
+    def count(self) -> int:
+        """Number of IDs recorded for this index and namespace."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM upserted_ids WHERE index_name = ? AND namespace = ?",
+                (self.index_name, self.namespace)
+            ).fetchone()[0]
+
+    def add(self, ids: Iterable[str]) -> None:
+        """Record ids as upserted."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO upserted_ids (index_name, namespace, id) VALUES (?, ?, ?)",
+                [(self.index_name, self.namespace, article_id) for article_id in ids]
+            )
+            self._conn.commit()
+
+    def discard(self, ids: Iterable[str]) -> None:
+        """Forget ids that turned out not to be in the index."""
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM upserted_ids WHERE index_name = ? AND namespace = ? AND id = ?",
+                [(self.index_name, self.namespace, article_id) for article_id in ids]
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Forget every ID recorded for this index and namespace."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM upserted_ids WHERE index_name = ? AND namespace = ?",
+                (self.index_name, self.namespace)
+            )
+            self._conn.commit()
+
 
 class VectorStore:
     """Handles vector database operations using Pinecone."""
@@ -21,112 +157,108 @@ class VectorStore:
         if not settings.pinecone_api_key:
             raise ValueError("PINECONE_API_KEY environment variable is required")
 
-        # Initialize Pinecone client
+        # Initialize Pinecone client (gRPC: protobuf payloads over one multiplexed HTTP/2 channel)
         self.pc = Pinecone(api_key=settings.pinecone_api_key)
 
         self.index_name = settings.pinecone_index_name
         self.namespace = settings.pinecone_namespace
 
-        # Check if index exists, create if not
-        existing_indexes = [index.name for index in self.pc.list_indexes()]
-        if self.index_name not in existing_indexes:
+        # Connecting looks the index up anyway, so only a missing index pays for creation
+        # async_req upserts share the gRPC channel, so several batches can be in flight at once
+        index_created = False
+        try:
+            self.index = self.pc.Index(self.index_name)
+        except NotFoundException:
+            index_created = True
             logger.info(f"Creating Pinecone index: {self.index_name}")
             self.pc.create_index(
                 name=self.index_name,
                 dimension=settings.embedding_dimension,
-                metric="cosine",
+                metric="dotproduct",  # Vectors are stored L2-normalized, so this equals cosine
                 spec=ServerlessSpec(
                     cloud="aws",
                     region="us-east-1"
                 )
             )
+            self.index = self.pc.Index(self.index_name)
 
-        # Connect to index
-        self.index = self.pc.Index(self.index_name)
         self.embedding_generator = get_embedding_generator()
+        self.upserted_ids = (
+            _UpsertedIds(settings.upserted_ids_path, self.index_name, self.namespace)
+            if settings.upserted_ids_path else None
+        )
+        # Set when the index holds fewer vectors than recorded, so recorded IDs are checked before skipping
+        self._verify_known_ids = False
+        if self.upserted_ids:
+            if index_created:
+                # A fresh index holds nothing, whatever an earlier index with this name held
+                self.upserted_ids.clear()
+            else:
+                self._check_upserted_ids()
+        # Bumped whenever this process changes the index, so result caches can key on it
+        self.data_version = 0
+        # describe_index_stats is a network round-trip; health checks only need it every few seconds
+        self._stats_cache: TTLCache = TTLCache(maxsize=1, ttl=settings.stats_cache_ttl)
+        self._stats_cache_lock = threading.Lock()
         logger.info(f"Initialized VectorStore with Pinecone index: {self.index_name}")
     
-    def add_articles(self, articles: List[Dict[str, Any]]) -> int:
+    def _check_upserted_ids(self) -> None:
+        """Compare the local upserted-ID record with the index and distrust it if vectors went missing."""
+        recorded = self.upserted_ids.count()
+        if not recorded:
+            return
+
+        index_stats = self.index.describe_index_stats()
+        namespace_stats = index_stats.namespaces.get(self.namespace)
+        indexed = namespace_stats.vector_count if namespace_stats else 0
+        if indexed < recorded:
+            # Vectors were deleted outside this process (or the index was recreated)
+            logger.warning(
+                f"Index {self.index_name}/{self.namespace} holds {indexed} vectors but {recorded} IDs are "
+                f"recorded as upserted; recorded IDs will be checked against the index before skipping"
+            )
+            self._verify_known_ids = True
+
+    def _existing_ids(self, ids: Iterable[str]) -> Set[str]:
+        """Return the subset of ids actually present in the index."""
+        ids = list(ids)
+        present: Set[str] = set()
+        for i in range(0, len(ids), 100):
+            fetch_result = self.index.fetch(ids=ids[i:i + 100], namespace=self.namespace)
+            present.update(fetch_result.vectors)
+        return present
+
+    def add_articles(self, articles: Iterable[Dict[str, Any]]) -> int:
         """
         Add articles to the vector store.
 
+        Articles are consumed in chunks, so any iterable (e.g. a generator over processed
+        files) can be streamed in without holding the whole set in memory; each chunk's
+        upload overlaps with embedding the next one.
+
         Args:
-            articles: List of article dictionaries
+            articles: Iterable of article dictionaries
 
         Returns:
             Number of articles successfully added
         """
-        if not articles:
-            return 0
-
         try:
-            logger.info(f"Adding {len(articles)} articles to vector store")
-
-            # Prepare texts for embedding
-            texts_for_embedding = []
-
-            for i, article in enumerate(articles):
-                # Use processed ID if available, otherwise generate one
-                if article.get('processed_id'):
-                    article_id = article['processed_id']
-                else:
-                    # Create unique ID using hash of title and link (fallback)
-                    content_hash = hashlib.md5(
-                        f"{article.get('title', '')}{article.get('link', '')}".encode()
-                    ).hexdigest()
-                    article_id = f"{article.get('source_name', 'unknown')}_{content_hash}"
-
-                # Prepare text for embedding
-                text = self.embedding_generator.prepare_text_for_embedding(article)
-                texts_for_embedding.append((article_id, text, article))
-
-            # Generate embeddings in batches
-            batch_size = 100  # Pinecone batch limit
             added_count = 0
+            pending_upserts: List[Tuple[Any, List[str]]] = []
+            iterator = iter(articles)
 
-            for i in range(0, len(texts_for_embedding), batch_size):
-                batch = texts_for_embedding[i:i + batch_size]
-                batch_texts = [item[1] for item in batch]
-
-                # Generate embeddings for this batch
-                batch_embeddings = self.embedding_generator.generate_embeddings(batch_texts)
-
-                # Prepare vectors for Pinecone
-                vectors = []
-                for j, (article_id, text, article) in enumerate(batch):
-                    # Prepare metadata (Pinecone has metadata size limits)
-                    # Use AI-enhanced data when available
-                    summary = article.get('ai_summary', article.get('summary', ''))
-                    tags = article.get('enhanced_tags', article.get('tags', []))
-                    categories = article.get('enhanced_categories', article.get('categories', []))
-
-                    metadata = {
-                        'title': article.get('title', '')[:1000],  # Limit length
-                        'link': article.get('link', ''),
-                        'summary': summary[:2000],  # Limit length - prefer AI summary
-                        'published': article.get('published', ''),
-                        'source_name': article.get('source_name', ''),
-                        'category': categories[0] if categories else article.get('category', 'general'),
-                        'tags': tags[:10] if isinstance(tags, list) else [],  # Limit number of tags
-                        'ai_enhanced': article.get('ai_enhanced', False),
-                        'added_to_db': datetime.now().isoformat(),
-                        'content_preview': text[:500]  # Store preview of content
-                    }
-
-                    vectors.append({
-                        'id': article_id,
-                        'values': batch_embeddings[j],
-                        'metadata': metadata
-                    })
-
-                # Upsert to Pinecone
-                self.index.upsert(
-                    vectors=vectors,
-                    namespace=self.namespace
-                )
+            while True:
+                chunk = list(islice(iterator, settings.vector_ingest_chunk_size))
+                if not chunk:
+                    break
 
-                added_count += len(vectors)
-                logger.info(f"Added batch of {len(vectors)} articles to Pinecone")
+                logger.info(f"Adding {len(chunk)} articles to vector store")
+                submitted = self._submit_articles(chunk)
+                # Wait on the previous chunk only now, so its upload ran while this one was embedded
+                added_count += self._collect_upserts(pending_upserts)
+                pending_upserts = submitted
+
+            added_count += self._collect_upserts(pending_upserts)
 
             logger.info(f"Successfully added {added_count} articles to vector store")
             return added_count
@@ -134,7 +266,134 @@ class VectorStore:
         except Exception as e:
             logger.error(f"Error adding articles to vector store: {str(e)}")
             raise
-    
+
+    def _submit_articles(self, articles: List[Dict[str, Any]]) -> List[Tuple[Any, List[str]]]:
+        """
+        Embed a chunk of articles and send its upserts without waiting for them.
+
+        Args:
+            articles: Article dictionaries in this chunk
+
+        Returns:
+            (async upsert result, vector IDs) per Pinecone batch, for _collect_upserts
+        """
+        # Resolve IDs first so articles already in the index skip text preparation too
+        identified = []
+        for article in articles:
+            # Use processed ID if available, otherwise generate one
+            if article.get('processed_id'):
+                article_id = article['processed_id']
+            else:
+                # Reuse the hash the processor already computed, otherwise hash title and link (fallback)
+                content_hash = article.get('content_hash')
+                if not content_hash:
+                    hasher = hashlib.md5(article.get('title', '').encode())
+                    hasher.update(_article_link(article).encode())
+                    content_hash = hasher.hexdigest()
+                article_id = f"{article.get('source_name', 'unknown')}_{content_hash}"
+            identified.append((article_id, article))
+
+        # Articles already in the index would only be re-embedded and re-upserted unchanged
+        if self.upserted_ids:
+            known_ids = self.upserted_ids.known(article_id for article_id, _ in identified)
+            if known_ids and self._verify_known_ids:
+                present_ids = self._existing_ids(known_ids)
+                missing_ids = known_ids - present_ids
+                if missing_ids:
+                    self.upserted_ids.discard(missing_ids)
+                    logger.warning(f"Re-adding {len(missing_ids)} recorded articles missing from the index")
+                known_ids = present_ids
+            if known_ids:
+                identified = [item for item in identified if item[0] not in known_ids]
+                logger.info(f"Skipping {len(known_ids)} articles already in vector store")
+            if not identified:
+                return []
+
+        # Prepare texts for embedding; only the short preview outlives the embedding call
+        texts = [self.embedding_generator.prepare_text_for_embedding(article) for _, article in identified]
+        texts_for_embedding = [
+            (article_id, text[:500], article) for (article_id, article), text in zip(identified, texts)
+        ]
+
+        # Embed the whole chunk in one call: the generator picks its own API batch size, runs the
+        # batches in parallel and checks its cache and duplicates across the chunk
+        all_embeddings = self.embedding_generator.generate_embeddings(texts)
+        # Unit-length rows make a dot product equal cosine similarity, matching the query side
+        norms = np.linalg.norm(all_embeddings, axis=1, keepdims=True)
+        all_embeddings /= np.where(norms > 0, norms, 1.0)
+        del texts  # Full texts are no longer needed; release them before building metadata
+
+        batch_size = 100  # Pinecone batch limit
+        # Upserts in flight, collected once every batch has been sent
+        pending_upserts = []
+        # One timestamp per chunk; per-article precision is not needed
+        now_iso = datetime.now().isoformat()
+
+        for i in range(0, len(texts_for_embedding), batch_size):
+            batch = texts_for_embedding[i:i + batch_size]
+            batch_embeddings = all_embeddings[i:i + batch_size]
+
+            # Prepare vectors for Pinecone
+            vectors = []
+            for j, (article_id, preview, article) in enumerate(batch):
+                # Prepare metadata (Pinecone has metadata size limits)
+                # Use AI-enhanced data when available
+                get = article.get
+                summary = get('ai_summary', get('summary', ''))
+                tags = get('enhanced_tags', get('tags', []))
+                categories = get('enhanced_categories', get('categories', []))
+
+                metadata = {
+                    'title': get('title', '')[:1000],  # Limit length
+                    'link': _article_link(article),
+                    'summary': summary[:2000],  # Limit length - prefer AI summary
+                    'published': get('published') or get('date', ''),
+                    'source_name': get('source_name', ''),
+                    'category': categories[0] if categories else get('category', 'general'),
+                    'tags': tags[:10] if isinstance(tags, list) else [],  # Limit number of tags
+                    'ai_enhanced': get('ai_enhanced', False),
+                    'added_to_db': now_iso,
+                    'content_preview': preview  # Store preview of content
+                }
+
+                vectors.append({
+                    'id': article_id,
+                    'values': batch_embeddings[j].tolist(),  # Pinecone expects plain floats
+                    'metadata': metadata
+                })
+
+            # Upsert to Pinecone without waiting for the response
+            async_result = self.index.upsert(
+                vectors=vectors,
+                namespace=self.namespace,
+                async_req=True
+            )
+            pending_upserts.append((async_result, [vector['id'] for vector in vectors]))
+
+        return pending_upserts
+
+    def _collect_upserts(self, pending_upserts: List[Tuple[Any, List[str]]]) -> int:
+        """
+        Wait for upserts sent by _submit_articles and record them.
+
+        Args:
+            pending_upserts: (async upsert result, vector IDs) pairs
+
+        Returns:
+            Number of vectors upserted
+        """
+        added_count = 0
+        for async_result, batch_ids in pending_upserts:
+            async_result.result()  # Raises if the upsert failed
+
+            if self.upserted_ids:
+                self.upserted_ids.add(batch_ids)
+            self.data_version += 1
+
+            added_count += len(batch_ids)
+            logger.info(f"Added batch of {len(batch_ids)} articles to Pinecone")
+        return added_count
+
     def search_similar_articles(self, query: str, n_results: int = None) -> List[Dict[str, Any]]:
         """
         Search for articles similar to the query.
@@ -149,41 +408,36 @@ class VectorStore:
         if n_results is None:
             n_results = settings.max_recommendations
 
-        try:
-            logger.info(f"Searching for articles similar to: {query}")
+        logger.info(f"Searching for articles similar to: {query}")
 
-            # Generate query embedding
-            query_embedding = self.embedding_generator.generate_query_embedding(query)
+        # Generate query embedding
+        query_embedding = self.embedding_generator.generate_query_embedding(query)
+        return self.search_by_embedding(query_embedding, n_results)
+
+    def search_by_embedding(self, query_embedding: np.ndarray, n_results: int = None) -> List[Dict[str, Any]]:
+        """
+        Search for articles near an already computed query embedding.
+
+        Args:
+            query_embedding: Normalized query vector from generate_query_embedding
+            n_results: Number of results to return (default from settings)
 
+        Returns:
+            List of similar articles with metadata
+        """
+        if n_results is None:
+            n_results = settings.max_recommendations
+
+        try:
             # Search in Pinecone
             search_results = self.index.query(
-                vector=query_embedding,
+                vector=query_embedding.tolist(),
                 top_k=n_results,
                 include_metadata=True,
                 namespace=self.namespace
             )
 
-            # Format results
-            articles = []
-            for match in search_results.matches:
-                similarity_score = match.score
-
-                # Filter by similarity threshold
-                if similarity_score >= settings.similarity_threshold:
-                    metadata = match.metadata
-                    article = {
-                        'id': match.id,
-                        'title': metadata.get('title', ''),
-                        'link': metadata.get('link', ''),
-                        'summary': metadata.get('summary', ''),
-                        'published': metadata.get('published', ''),
-                        'source_name': metadata.get('source_name', ''),
-                        'category': metadata.get('category', 'general'),
-                        'tags': metadata.get('tags', []),
-                        'similarity_score': similarity_score,
-                        'content_preview': metadata.get('content_preview', '')
-                    }
-                    articles.append(article)
+            articles = _format_matches(search_results.matches, n_results)
 
             logger.info(f"Found {len(articles)} similar articles")
             return articles
@@ -215,37 +469,14 @@ class VectorStore:
 
             # Search in Pinecone with category filter
             search_results = self.index.query(
-                vector=query_embedding,
+                vector=query_embedding.tolist(),
                 top_k=n_results * 2,  # Get more results to account for filtering
                 include_metadata=True,
                 namespace=self.namespace,
                 filter={"category": {"$eq": category}}
             )
 
-            # Format results
-            articles = []
-            for match in search_results.matches:
-                similarity_score = match.score
-
-                # Filter by similarity threshold
-                if similarity_score >= settings.similarity_threshold:
-                    metadata = match.metadata
-                    article = {
-                        'id': match.id,
-                        'title': metadata.get('title', ''),
-                        'link': metadata.get('link', ''),
-                        'summary': metadata.get('summary', ''),
-                        'published': metadata.get('published', ''),
-                        'source_name': metadata.get('source_name', ''),
-                        'category': metadata.get('category', 'general'),
-                        'similarity_score': similarity_score,
-                        'content_preview': metadata.get('content_preview', '')
-                    }
-                    articles.append(article)
-
-                    # Stop if we have enough results
-                    if len(articles) >= n_results:
-                        break
+            articles = _format_matches(search_results.matches, n_results)
 
             logger.info(f"Found {len(articles)} similar articles in category: {category}")
             return articles
@@ -272,18 +503,7 @@ class VectorStore:
             )
 
             if article_id in fetch_result.vectors:
-                vector_data = fetch_result.vectors[article_id]
-                metadata = vector_data.metadata
-
-                return {
-                    'id': article_id,
-                    'title': metadata.get('title', ''),
-                    'link': metadata.get('link', ''),
-                    'summary': metadata.get('summary', ''),
-                    'content': metadata.get('content_preview', ''),
-                    'published': metadata.get('published', ''),
-                    'source_name': metadata.get('source_name', ''),
-                }
+                return _source_article(article_id, fetch_result.vectors[article_id].metadata)
 
             return None
 
@@ -310,64 +530,82 @@ class VectorStore:
         try:
             logger.info(f"Searching for articles similar to article ID: {article_id}")
 
-            # First, fetch the source article to get its vector
-            fetch_result = self.index.fetch(
-                ids=[article_id],
+            # Query by ID: Pinecone looks up the stored vector server-side (no fetch or re-embedding needed)
+            search_results = self.index.query(
+                id=article_id,
+                top_k=n_results + (1 if exclude_source else 0),  # +1 to account for source article
+                include_metadata=True,
                 namespace=self.namespace
             )
 
-            if article_id not in fetch_result.vectors:
+            # An unknown ID comes back with no matches rather than an error
+            if not search_results.matches:
                 logger.warning(f"Article with ID {article_id} not found")
                 return []
 
-            # Get the source article's vector
-            source_vector = fetch_result.vectors[article_id].values
+            # Skip the source article if requested
+            articles = _format_matches(
+                search_results.matches, n_results, exclude_id=article_id if exclude_source else None
+            )
+
+            logger.info(f"Found {len(articles)} similar articles for article {article_id}")
+            return articles
+
+        except Exception as e:
+            logger.error(f"Error searching for similar articles by ID {article_id}: {str(e)}")
+            raise
+    
+    def query_with_source(self, article_id: str, top_k: int = None) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Fetch an article and its nearest neighbors in a single Pinecone query.
+
+        Querying by ID lets Pinecone look up the stored vector server-side, and
+        the source article comes back as one of the matches (normally the first),
+        so its metadata does not need a separate fetch.
+
+        Args:
+            article_id: ID of the source article
+            top_k: Number of neighbors to return (default from settings)
+
+        Returns:
+            Tuple of (source article dict or None if not found, list of similar articles)
+        """
+        if top_k is None:
+            top_k = settings.max_recommendations
+
+        try:
+            logger.info(f"Querying article {article_id} together with its {top_k} nearest neighbors")
 
-            # Search using the existing vector directly (no re-embedding needed!)
             search_results = self.index.query(
-                vector=source_vector,
-                top_k=n_results + (1 if exclude_source else 0),  # +1 to account for source article
+                id=article_id,
+                top_k=top_k + 1,  # +1 because the source article is among the matches
                 include_metadata=True,
                 namespace=self.namespace
             )
 
-            # Format results
-            articles = []
+            source_article = None
             for match in search_results.matches:
-                # Skip the source article if requested
-                if exclude_source and match.id == article_id:
-                    continue
-
-                similarity_score = match.score
-
-                # Filter by similarity threshold
-                if similarity_score >= settings.similarity_threshold:
-                    metadata = match.metadata
-                    article = {
-                        'id': match.id,
-                        'title': metadata.get('title', ''),
-                        'link': metadata.get('link', ''),
-                        'summary': metadata.get('summary', ''),
-                        'published': metadata.get('published', ''),
-                        'source_name': metadata.get('source_name', ''),
-                        'category': metadata.get('category', 'general'),
-                        'tags': metadata.get('tags', []),
-                        'similarity_score': similarity_score,
-                        'content_preview': metadata.get('content_preview', '')
-                    }
-                    articles.append(article)
-
-                    # Stop if we have enough results
-                    if len(articles) >= n_results:
-                        break
+                if match.id == article_id:
+                    source_article = _source_article(article_id, match.metadata)
+                    break
+
+            articles = _format_matches(search_results.matches, top_k, exclude_id=article_id)
+
+            # Near-duplicates can outrank the source itself; fall back to a direct fetch then
+            if source_article is None and search_results.matches:
+                source_article = self.get_article_by_id(article_id)
+
+            if source_article is None:
+                logger.warning(f"Article with ID {article_id} not found")
+                return None, []
 
             logger.info(f"Found {len(articles)} similar articles for article {article_id}")
-            return articles
+            return source_article, articles
 
         except Exception as e:
-            logger.error(f"Error searching for similar articles by ID {article_id}: {str(e)}")
+            logger.error(f"Error querying article {article_id} with neighbors: {str(e)}")
             raise
-    
+
     def get_collection_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the vector store collection.
@@ -376,8 +614,13 @@ class VectorStore:
             Dictionary with collection statistics
         """
         try:
-            # Get index stats from Pinecone
-            index_stats = self.index.describe_index_stats()
+            # Get index stats from Pinecone, reusing a recent answer if the index has not changed since
+            with self._stats_cache_lock:
+                index_stats = self._stats_cache.get(self.data_version)
+            if index_stats is None:
+                index_stats = self.index.describe_index_stats()
+                with self._stats_cache_lock:
+                    self._stats_cache[self.data_version] = index_stats
 
             # Get total vector count
             total_vectors = 0
@@ -407,6 +650,9 @@ class VectorStore:
         try:
             # Delete all vectors in the namespace
             self.index.delete(delete_all=True, namespace=self.namespace)
+            if self.upserted_ids:
+                self.upserted_ids.clear()
+            self.data_version += 1
 
             logger.info("Cleared all articles from vector store")
             return True
@@ -418,11 +664,15 @@ class VectorStore:
 
 # Global vector store instance
 vector_store = None
+_vector_store_lock = threading.Lock()
 
 
 def get_vector_store() -> VectorStore:
     """Get or create the global vector store instance."""
     global vector_store
     if vector_store is None:
-        vector_store = VectorStore()
+        with _vector_store_lock:
+            # Re-check: another thread may have finished construction while this one waited
+            if vector_store is None:
+                vector_store = VectorStore()
     return vector_store